@@ -1,24 +1,28 @@
 from socketpool import SocketPool
-from adafruit_httpserver import Server, Request, Response, JSONResponse
+from adafruit_httpserver import Server, Request, JSONResponse
+from utils import static
+from utils.assets import AssetIndex
 import wifi, time
 
 class PortalServer:
-    def __init__(self, config):
+    def __init__(self, config, leaderboard=None):
         self.pool = SocketPool(wifi.radio)
         self.server = Server(self.pool, "/_www")
         self.server.request_buffer_size = 2048
+        self.assets = AssetIndex("/_www")
         self.config = config
+        self.leaderboard = leaderboard
 
         # Define route for serving index.html
         @self.server.route("/")
         def index(request: Request):
             print("Serving index.html")
-            return self.serve_file(request, "/_www/index.html")
+            return self.serve_file(request, "/index.html")
 
         # Define route for serving static files
         @self.server.route("/assets/<path:path>")
         def static_files(request: Request, path: str):
-            return self.serve_file(request, f"/_www/static/{path}")
+            return self.serve_file(request, f"/assets/{path}")
         
         # Define route for serving index.html
         @self.server.route("/api")
@@ -35,6 +39,8 @@ class PortalServer:
             while True:
                 try:
                     self.server.poll()  # Handle incoming requests
+                    if self.leaderboard:
+                        self.leaderboard.maybe_flush()
                 except Exception as e:
                     print(f"An error occurred: {e}")
                     print("Restarting server in 5 seconds...")
@@ -44,21 +50,10 @@ class PortalServer:
             pass
 
     def serve_file(self, request: Request, file_path: str):
+        # file_path is relative to /_www; unknown paths 404 without touching flash
         try:
-            with open(file_path, "r") as file:
-                content = file.read()
-            content_type = self.get_content_type(file_path)
-            return Response(request, content, content_type=content_type)
+            # Streamed from flash through a shared chunk buffer
+            return static.file_response(request, self.assets, file_path)
         except Exception as e:
             print(f"Error serving file {file_path}: {e}")
-            return Response(request, "File not found", status=404)
-
-    def get_content_type(self, file_path: str) -> str:
-        if file_path.endswith(".html"):
-            return "text/html"
-        elif file_path.endswith(".css"):
-            return "text/css"
-        elif file_path.endswith(".js"):
-            return "application/javascript"
-        else:
-            return "text/plain"
\ No newline at end of file
+            return static.not_found(request)
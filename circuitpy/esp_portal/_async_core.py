@@ -0,0 +1,118 @@
+# _async_core.py
+# Opt-in asyncio server core (SCHEDULER MODE "ASYNC"), an alternative to the
+# Scheduler tick loop. Same pollables, same poll() contract, so the games
+# need no changes:
+#   - one task for the HTTP server,
+#   - one task per game (and the Hub) that parks on an Event while the game
+#     has no rooms and naps between polls while it does,
+#   - one timer task per periodic job (leaderboard flush, heartbeat wheel).
+# socketpool sockets can't be awaited for readiness on CircuitPython, so
+# wake-ups come from the tasks that know work arrived: a finished handshake
+# wakes every game, and frames routed by the Hub wake the games reading
+# them. Quiet tasks back off on their own instead of sharing one
+# fixed-length tick.
+
+import asyncio
+from ._metrics import METRICS, ticks_diff, ticks_us
+
+class AsyncCore:
+    def __init__(self, poll_http, games, config=None, timers=(), feeders=()):
+        """
+        poll_http:  callable that services HTTP/WS handshakes and returns
+                    True when it handled a request.
+        games:      pollables with `rooms` and poll(), as for Scheduler.
+        timers:     (period_s, callable) pairs run on their own timers.
+        feeders:    pollables whose frames are read by the other games
+                    (the Hub); work they handle wakes the games.
+        """
+        cfg = (config or {}).get("SCHEDULER", {})
+        self.min_sleep = cfg.get("MIN_SLEEP", 0.001)
+        self.max_sleep = cfg.get("MAX_SLEEP", 0.01)
+        self.idle_sleep = cfg.get("IDLE_SLEEP", 0.05)
+        self.poll_http = poll_http
+        self.games = games
+        self.timers = list(timers)
+        self.feeders = feeders
+        self.wake = [asyncio.Event() for _ in games]
+
+    def _wake_all(self, skip=None):
+        for i, event in enumerate(self.wake):
+            if i != skip:
+                event.set()
+
+    async def _nap(self, event, delay):
+        """Sleeps up to delay seconds, returning early once event is set."""
+        if not event.is_set():
+            try:
+                await asyncio.wait_for(event.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        event.clear()
+
+    async def _http_task(self):
+        sleep = self.min_sleep
+        while True:
+            metrics = METRICS.enabled
+            t0 = ticks_us() if metrics else 0
+            handled = self.poll_http()
+            if metrics:
+                METRICS.observe("http_poll_us", ticks_diff(ticks_us(), t0))
+            if handled:
+                self._wake_all()  # a new socket may have joined a parked game
+                sleep = self.min_sleep
+                await asyncio.sleep(0)
+                continue
+            live = False
+            for g in self.games:
+                if g.rooms:
+                    live = True
+                    break
+            cap = self.max_sleep if live else self.idle_sleep
+            await asyncio.sleep(sleep)
+            sleep = min(sleep * 2, cap)
+
+    async def _game_task(self, i):
+        game = self.games[i]
+        event = self.wake[i]
+        key = f"game_poll_us.{game.__name__}"
+        feeder = game in self.feeders
+        sleep = self.min_sleep
+        while True:
+            if not game.rooms:
+                await event.wait()  # parked: nothing connected to this game
+                event.clear()
+                sleep = self.min_sleep
+                continue
+            metrics = METRICS.enabled
+            t0 = ticks_us() if metrics else 0
+            frames = game.poll() or 0
+            if metrics:
+                METRICS.observe(key, ticks_diff(ticks_us(), t0))
+                METRICS.incr("async_polls")
+            if frames:
+                if feeder:
+                    self._wake_all(i)
+                sleep = self.min_sleep
+                await asyncio.sleep(0)
+            else:
+                await self._nap(event, sleep)
+                sleep = min(sleep * 2, self.max_sleep)
+
+    async def _timer_task(self, period, job):
+        while True:
+            await asyncio.sleep(period)
+            try:
+                job()
+            except Exception as e:
+                print("Timer job error:", e)
+
+    async def run(self):
+        tasks = [asyncio.create_task(self._http_task())]
+        for i in range(len(self.games)):
+            tasks.append(asyncio.create_task(self._game_task(i)))
+        for period, job in self.timers:
+            tasks.append(asyncio.create_task(self._timer_task(period, job)))
+        await asyncio.gather(*tasks)
+
+    def serve_forever(self):
+        asyncio.run(self.run())
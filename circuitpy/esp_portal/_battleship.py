@@ -1,16 +1,15 @@
 # battleship.py
 # CircuitPython + adafruit_httpserver.Websocket
 # Robust Dots & Boxes manager with deferred initial send and safe polling.
+# Socket lifecycle and per-room broadcast live in _room.GameRoom.
 
-import json
+from ._room import GameRoom, DEFAULT_ROOM
 
-class Battleship:
-    # Live sockets + sockets that need their first state send on next poll
-    ws_clients = set()
-    ws_needs_init = set()
-    _instance = None
+class Battleship(GameRoom):
+    rooms = {}
 
-    def __init__(self):
+    def __init__(self, room=DEFAULT_ROOM):
+        super().__init__(room)
         self.BOARD_SIZE = 8
         self.BOXES_SIZE = self.BOARD_SIZE - 1
         # board[r][c] = [hOwner, vOwner]; owners are 0|1|2
@@ -22,127 +21,35 @@ class Battleship:
             "winner": 0,
         }
 
-    # ---------- singleton ----------
-    @classmethod
-    def _get_instance(cls):
-        if cls._instance is None:
-            cls._instance = Battleship()
-        return cls._instance
-
-    # ---------- websocket lifecycle ----------
-    @classmethod
-    def handle_ws(cls, ws):
-        """
-        Called from route after creating Websocket(request).
-        We don't send immediately—some stacks will drop a frame
-        sent in the same handler. We queue it for the next poll().
-        """
-        cls._get_instance()  # ensure instance exists
-        cls.ws_clients.add(ws)
-        cls.ws_needs_init.add(ws)  # send state on next poll tick
-
-    @classmethod
-    def on_disconnect(cls, ws):
-        if ws in cls.ws_clients:
-            cls.ws_clients.discard(ws)
-        if ws in cls.ws_needs_init:
-            cls.ws_needs_init.discard(ws)
-
-    # ---------- main poll loop ----------
-    @classmethod
-    def poll(cls):
-        """
-        Call from the main server loop (after server.poll()).
-        - Sends initial state to new sockets.
-        - Reads any inbound frames and applies moves.
-        - Broadcasts state after changes.
-        """
-        inst = cls._get_instance()
-
-        # 1) Send initial state to sockets that just upgraded
-        if cls.ws_needs_init:
-            dead = []
-            for ws in tuple(cls.ws_needs_init):
-                try:
-                    payload = {"type": "state"}
-                    payload.update(inst.game_state)
-                    payload["count"] = len(cls.ws_clients) - 1  # exclude dashboard
-                    ws.send_message(json.dumps(payload))
-                except Exception:
-                    dead.append(ws)
-                finally:
-                    # either way, don't try to init twice
-                    cls.ws_needs_init.discard(ws)
-            for ws in dead:
-                try:
-                    ws.close()
-                except Exception:
-                    pass
-                cls.ws_clients.discard(ws)
-
-        # 2) Service all active sockets
-        for ws in tuple(cls.ws_clients):
-            # Read one frame (non-blocking; returns None if none)
-            try:
-                msg = ws.receive()
-            except Exception:
-                # Treat read errors as disconnects
-                try:
-                    ws.close()
-                except Exception:
-                    pass
-                cls.on_disconnect(ws)
-                continue
-
-            if not msg:
-                # No frame available (None or empty string); next socket
-                continue
-
-            # Process message safely
-            changed = False
-            try:
-                data = json.loads(msg)
-            except Exception:
-                data = None
-
-            if not isinstance(data, dict):
-                # Unknown/invalid frame
-                continue
-
-            mtype = data.get("type")
-
-            if mtype == "ping":
-                # Optional: could reply with pong; not required on LAN
-                continue
-
-            if mtype == "reset":
-                inst._reset_game()
-                changed = True
-
-            elif mtype == "join":
-                # Client announces preferred player; state doesn't change here.
-                # You can enforce one-socket-per-player if desired.
-                # We still rebroadcast so UIs can reflect connection counts.
-                changed = True
-
-            else:
-                # Accept both schemas:
-                # A) {player,row,col,orientation:"h"|"v"}
-                # B) {type:"move", t:"h"|"v", r:int, c:int, player?:int}
-                t = data.get("orientation");  r = data.get("row");  c = data.get("col")
-                if t is None: t = data.get("t")
-                if r is None: r = data.get("r")
-                if c is None: c = data.get("c")
-                player = data.get("player")
-                if player is None:
-                    player = inst.game_state.get("currentPlayer", 1)
-
-                if isinstance(r, int) and isinstance(c, int) and t in ("h","v") and player in (1,2):
-                    if inst._apply_move(player, t, r, c):
-                        changed = True
-
-            if changed:
-                inst._broadcast_state()
+    # ---------- messages ----------
+    def _handle(self, data):
+        mtype = data.get("type")
+
+        if mtype == "reset":
+            self._reset_game()
+            return True
+
+        if mtype == "join":
+            # Client announces preferred player; state doesn't change here.
+            # You can enforce one-socket-per-player if desired.
+            # We still rebroadcast so UIs can reflect connection counts.
+            self.delta = {"count": len(self.ws_clients) - 1}
+            return True
+
+        # Accept both schemas:
+        # A) {player,row,col,orientation:"h"|"v"}
+        # B) {type:"move", t:"h"|"v", r:int, c:int, player?:int}
+        t = data.get("orientation");  r = data.get("row");  c = data.get("col")
+        if t is None: t = data.get("t")
+        if r is None: r = data.get("r")
+        if c is None: c = data.get("c")
+        player = data.get("player")
+        if player is None:
+            player = self.game_state.get("currentPlayer", 1)
+
+        if isinstance(r, int) and isinstance(c, int) and t in ("h","v") and player in (1,2):
+            return self._apply_move(player, t, r, c)
+        return False
 
     # ---------- game logic ----------
     def _reset_game(self):
@@ -164,7 +71,7 @@ class Battleship:
         boxes = self.game_state["boxes"]
         scores = self.game_state["scores"]
 
-        claimed_box = False
+        claimed = []  # [row, col] of boxes this edge completed
 
         if t == "h":
             # Horizontal edge: row in [0..BOARD_SIZE-1], col in [0..BOXES_SIZE-1]
@@ -178,11 +85,11 @@ class Battleship:
             if row > 0 and self._is_box_complete(row - 1, col):
                 boxes[row - 1][col] = player
                 scores[player] += 1
-                claimed_box = True
+                claimed.append([row - 1, col])
             if row < self.BOXES_SIZE and self._is_box_complete(row, col):
                 boxes[row][col] = player
                 scores[player] += 1
-                claimed_box = True
+                claimed.append([row, col])
 
         elif t == "v":
             # Vertical edge: row in [0..BOXES_SIZE-1], col in [0..BOARD_SIZE-1]
@@ -196,11 +103,11 @@ class Battleship:
             if col > 0 and self._is_box_complete(row, col - 1):
                 boxes[row][col - 1] = player
                 scores[player] += 1
-                claimed_box = True
+                claimed.append([row, col - 1])
             if col < self.BOXES_SIZE and self._is_box_complete(row, col):
                 boxes[row][col] = player
                 scores[player] += 1
-                claimed_box = True
+                claimed.append([row, col])
 
         # Winner?
         total_boxes = self.BOXES_SIZE * self.BOXES_SIZE
@@ -213,9 +120,17 @@ class Battleship:
                 self.game_state["winner"] = 0
 
         # Turn swap only if no box was claimed
-        if not claimed_box:
+        if not claimed:
             self.game_state["currentPlayer"] = 2 if player == 1 else 1
 
+        # Everything a delta client needs to replay the move
+        self.delta = {
+            "e": [t, row, col, player],
+            "b": claimed,
+            "s": [scores[1], scores[2]],
+            "p": self.game_state["currentPlayer"],
+            "w": self.game_state["winner"],
+        }
         return True
 
     def _is_box_complete(self, row, col):
@@ -230,24 +145,3 @@ class Battleship:
             )
         except Exception:
             return False
-
-    # ---------- broadcast ----------
-    def _broadcast_state(self):
-        payload = {"type": "state"}
-        payload.update(self.game_state)
-        payload["count"] = len(self.ws_clients) - 1  # exclude dashboard
-        data = json.dumps(payload)
-
-        dead = []
-        for ws in tuple(self.ws_clients):
-            try:
-                ws.send_message(data)
-            except Exception:
-                dead.append(ws)
-
-        for ws in dead:
-            try:
-                ws.close()
-            except Exception:
-                pass
-            self.ws_clients.discard(ws)
@@ -0,0 +1,501 @@
+# _dnb_ai.py
+# Computer player for Dots & Boxes, searched in time slices.
+#
+# Values are "net boxes from here on for the player to move". That depends
+# only on which edges are drawn, not who drew them, so one transposition
+# table entry serves both colours and stays valid from one move to the next.
+#
+# Search: iterative-deepening negamax with alpha-beta over a scratch copy of
+# the engine's edge / box-side arrays. A completed box keeps the turn, so the
+# child value is added instead of negated. Pending captures are resolved
+# without spending depth (take the box, or at the end of a chain / loop
+# double-deal it), so the horizon never falls mid-capture. Once no safe move
+# is left and the board is nothing but chains and loops, the exact value
+# comes from chain analysis instead of further search.
+#
+# Slicing: think() is a generator. Work is counted in ops: a node is one,
+# an edge or box scan (_classify, _capture_moves, _components) about 1/16
+# of the scanned size, a new chain-analysis entry one per component. The
+# clock is read every CHECK_OPS, and the search unwinds with _Slice once the
+# slice is used up. The interrupted root move is searched again on the next slice
+# and walks straight through the subtrees that already finished via the
+# table (and the chain memo). One slice never runs much past its budget, so
+# other sockets keep being served.
+#
+# Python ints past 30 bits are heap-allocated on CircuitPython, so the edge
+# bitmask is never built as an int: the table key is its Zobrist hash (XOR
+# of a random 30-bit word per drawn edge), updated in place as edges are
+# drawn and undone.
+
+import random
+from array import array
+from ._metrics import ticks_add, ticks_diff, ticks_us
+
+# level -> (max depth, think time ms); depth 0 plays greedily without search
+LEVELS = {
+    "easy": (0, 0),
+    "medium": (2, 400),
+    "hard": (40, 2500),
+}
+DEFAULT_LEVEL = "medium"
+CHECK_OPS = 8       # work between clock checks, in ops (one node = 1)
+CHAIN_MEMO = 512    # chain-analysis entries kept after an evaluation
+
+EXACT, LOWER, UPPER = 0, 1, 2
+EXACT_DEPTH = 255   # table depth for values that no deeper search can change
+
+
+class _Slice(Exception):
+    # Raised fresh each slice: a reused instance keeps growing its
+    # traceback (and every frame in it) on CPython
+    pass
+
+
+def _shuffled(items):
+    for i in range(len(items) - 1, 0, -1):
+        j = random.randrange(i + 1)
+        items[i], items[j] = items[j], items[i]
+    return items
+
+
+class DnBAI:
+    tt_size = 4096        # table slots, rounded down to a power of two
+    think_ms = {}         # per-level overrides of LEVELS think time
+
+    def __init__(self, engine, player, level=DEFAULT_LEVEL):
+        if level not in LEVELS:
+            level = DEFAULT_LEVEL
+        self.player = player
+        self.level = level
+        self.max_depth, think = LEVELS[level]
+        self.think_us = self.think_ms.get(level, think) * 1000
+
+        n, m = engine.size, engine.boxes_size
+        h = engine.h_edges
+        self.edge_count = engine.edge_count
+        self.box_count = engine.box_count
+        self.edge_box_a = engine.edge_box_a
+        self.edge_box_b = engine.edge_box_b
+        # box -> its four edges: top, bottom, left, right
+        self.box_edges = array("h", [0] * (4 * self.box_count))
+        for r in range(m):
+            for c in range(m):
+                b = 4 * (r * m + c)
+                self.box_edges[b] = r * m + c
+                self.box_edges[b + 1] = (r + 1) * m + c
+                self.box_edges[b + 2] = h + r * n + c
+                self.box_edges[b + 3] = h + r * n + c + 1
+        self.zobrist = array("l", [random.getrandbits(30) for _ in range(self.edge_count)])
+
+        # scratch position the search works on
+        self.edges = bytearray(self.edge_count)
+        self.sides = bytearray(self.box_count)
+        self.left = 0
+        self.key = 0
+        self.path = []
+        self.low = 0          # open boxes with at most one side drawn
+        self.threes = 0       # boxes up for capture
+
+        # transposition table: parallel arrays indexed by key & tt_mask,
+        # always-replace, so a store never allocates
+        slots = 1
+        while slots * 2 <= self.tt_size:
+            slots *= 2
+        self.tt_mask = slots - 1
+        self.tt_key = array("l", [-1] * slots)
+        self.tt_depth = bytearray(slots)
+        self.tt_flag = bytearray(slots)
+        self.tt_value = array("h", [0] * slots)
+        self.tt_move = array("h", [-1] * slots)
+        self.chains = {}      # sorted component tuple -> value, see _loony_value
+        self.scan_cost = (self.edge_count >> 4) + 1
+        self.nodes = 0
+        self.ops = 0          # work since the last clock check
+        self.depth = 0        # last completed iteration
+        self.best = -1
+        self.started = 0
+        self.slice_end = 0
+        self._gen = None
+        self._drawn = -1
+
+    @classmethod
+    def configure(cls, config):
+        """Reads DOTS_AND_BOXES.AI (TT_SIZE, THINK_MS per level)."""
+        cfg = config or {}
+        cls.tt_size = cfg.get("TT_SIZE", cls.tt_size)
+        cls.think_ms = cfg.get("THINK_MS", cls.think_ms)
+
+    # ---------- driving ----------
+    def step(self, engine, budget_us):
+        """
+        Thinks for at most ~budget_us. Returns the chosen edge id once the
+        search is done, -1 while it still needs more slices.
+        """
+        if self._gen is None or self._drawn != engine.drawn:
+            self._start(engine)
+        self.slice_end = ticks_add(ticks_us(), budget_us)
+        self.ops = 0
+        try:
+            next(self._gen)
+            return -1
+        except StopIteration:
+            self._gen = None
+            return self.best
+
+    def cancel(self):
+        """Drops a search in progress (board reset, seat changed)."""
+        self._gen = None
+
+    def _start(self, engine):
+        edges, sides, zobrist = self.edges, self.sides, self.zobrist
+        key = left = 0
+        for e in range(self.edge_count):
+            if engine.edges[e]:
+                edges[e] = 1
+                key ^= zobrist[e]
+            else:
+                edges[e] = 0
+                left += 1
+        low = threes = 0
+        for b in range(self.box_count):
+            s = sides[b] = engine.box_sides[b]
+            if s <= 1:
+                low += 1
+            elif s == 3:
+                threes += 1
+        self.low = low
+        self.threes = threes
+        self.key = key
+        self.left = left
+        del self.path[:]
+        self.nodes = 0
+        self.depth = 0
+        self.best = -1
+        self._drawn = engine.drawn
+        self.started = ticks_us()
+        self._gen = self.think()
+
+    def think(self):
+        """Generator: yields between slices; leaves the move in self.best."""
+        captures, safe, unsafe = self._classify()
+        if self.max_depth == 0 or self.left == 1:
+            pool = captures or safe or unsafe
+            self.best = pool[random.randrange(len(pool))]
+            return
+        moves = self._capture_moves()
+        if moves is not None and len(moves) == 1:
+            self.best = moves[0]   # free box: nothing to weigh
+            return
+        if moves is None:
+            # shuffled so equal moves don't always come out the same
+            moves = _shuffled(safe) + _shuffled(unsafe)
+        self.best = moves[0]
+        inf = self.box_count + 1
+        deadline = ticks_add(self.started, self.think_us)
+        for depth in range(1, self.max_depth + 1):
+            alpha = -inf
+            best, i = -1, 0
+            scores = {}
+            while i < len(moves):
+                e = moves[i]
+                try:
+                    k = self._draw(e)
+                    if k:
+                        v = k + self._search(depth - 1, alpha - k, inf - k)
+                    else:
+                        v = -self._search(depth - 1, -inf, -alpha)
+                    self._undraw(e)
+                except _Slice:
+                    self._unwind()
+                    if ticks_diff(ticks_us(), deadline) >= 0:
+                        break
+                    yield
+                    continue
+                scores[e] = v
+                if v > alpha:
+                    alpha, best = v, e
+                i += 1
+            # A part-searched iteration still beats the last one as long as
+            # the previous best move (searched first) was in it
+            if best >= 0:
+                self.best = best
+            if i < len(moves):
+                return
+            self.depth = depth
+            moves.sort(key=lambda e: -scores[e])
+            if depth >= self.left or ticks_diff(ticks_us(), deadline) >= 0:
+                return
+            yield
+
+    # ---------- position ----------
+    def _draw(self, e):
+        """Draws e on the scratch board; returns the boxes it completed."""
+        self.edges[e] = 1
+        self.key ^= self.zobrist[e]
+        self.left -= 1
+        self.path.append(e)
+        k = 0
+        sides = self.sides
+        for b in (self.edge_box_a[e], self.edge_box_b[e]):
+            if b < 0:
+                continue
+            s = sides[b] + 1
+            sides[b] = s
+            if s == 2:
+                self.low -= 1
+            elif s == 3:
+                self.threes += 1
+            elif s == 4:
+                self.threes -= 1
+                k += 1
+        return k
+
+    def _undraw(self, e):
+        self.path.pop()
+        self.edges[e] = 0
+        self.key ^= self.zobrist[e]
+        self.left += 1
+        sides = self.sides
+        for b in (self.edge_box_a[e], self.edge_box_b[e]):
+            if b < 0:
+                continue
+            s = sides[b]
+            sides[b] = s - 1
+            if s == 2:
+                self.low += 1
+            elif s == 3:
+                self.threes -= 1
+            elif s == 4:
+                self.threes += 1
+
+    def _unwind(self):
+        while self.path:
+            self._undraw(self.path[-1])
+
+    def _other_edge(self, b, e):
+        """b's undrawn edge other than e (b has exactly two), or -1."""
+        be, edges = self.box_edges, self.edges
+        for i in range(4 * b, 4 * b + 4):
+            f = be[i]
+            if f != e and not edges[f]:
+                return f
+        return -1
+
+    def _across(self, e, b):
+        """The box on the other side of e from b, or -1 at the border."""
+        a = self.edge_box_a[e]
+        return self.edge_box_b[e] if a == b else a
+
+    def _classify(self):
+        """Undrawn edges split into (captures, safe moves, sacrifices)."""
+        self.ops += self.scan_cost
+        captures, safe, unsafe = [], [], []
+        edges, sides, ea, eb = self.edges, self.sides, self.edge_box_a, self.edge_box_b
+        for e in range(self.edge_count):
+            if edges[e]:
+                continue
+            a, b = ea[e], eb[e]
+            sa = sides[a] if a >= 0 else 0
+            sb = sides[b] if b >= 0 else 0
+            if sa == 3 or sb == 3:
+                captures.append(e)
+            elif sa == 2 or sb == 2:
+                unsafe.append(e)
+            else:
+                safe.append(e)
+        return captures, safe, unsafe
+
+    def _capture_moves(self):
+        """
+        Moves worth trying while a box is up for grabs: a free capture alone
+        when there is one, else [capture, double-deal] at the end of a chain
+        (A-B, B's far side open) or of a loop (A-B-C-D, D already taken on
+        three sides). Returns None when nothing can be captured.
+        """
+        self.ops += self.scan_cost
+        edges, sides, ea, eb = self.edges, self.sides, self.edge_box_a, self.edge_box_b
+        choice = None
+        for e in range(self.edge_count):
+            if edges[e]:
+                continue
+            a, b = ea[e], eb[e]
+            if a >= 0 and sides[a] == 3:
+                box, other = a, b
+            elif b >= 0 and sides[b] == 3:
+                box, other = b, a
+            else:
+                continue
+            if other < 0 or sides[other] != 2:
+                return [e]   # nothing behind it to give back
+            f = self._other_edge(other, e)
+            nxt = self._across(f, other)
+            if nxt < 0 or sides[nxt] < 2:
+                deal = f     # A-B is the end of a chain
+            elif sides[nxt] == 2:
+                g = self._other_edge(nxt, f)
+                last = self._across(g, nxt)
+                if last < 0 or sides[last] != 3:
+                    return [e]   # the chain runs on: keep taking
+                deal = f     # last four boxes of an opened loop
+            else:
+                return [e]
+            if choice is None:
+                choice = [e, deal]
+        return choice
+
+    # ---------- search ----------
+    def _search(self, depth, alpha, beta):
+        self.nodes += 1
+        self.ops += 1
+        if self.ops >= CHECK_OPS:
+            self._check_clock()
+        if not self.left:
+            return 0
+
+        key = self.key
+        slot = key & self.tt_mask
+        hint = -1
+        if self.tt_key[slot] == key:
+            hint = self.tt_move[slot]
+            if self.tt_depth[slot] >= depth:
+                flag = self.tt_flag[slot]
+                value = self.tt_value[slot]
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        child = depth   # captures don't spend depth
+        moves = self._capture_moves() if self.threes else None
+        if moves is None:
+            if not self.low:
+                # every open box has two sides: no safe move is left and
+                # the board is all chains and loops
+                value = self._loony_value(self._components())
+                if len(self.chains) >= CHAIN_MEMO:
+                    self.chains.clear()   # never mid-evaluation: a cut-off one resumes
+                self._store(key, EXACT_DEPTH, EXACT, value, -1)
+                return value
+            if depth <= 0:
+                return 0   # quiet position at the horizon
+            _, safe, unsafe = self._classify()
+            # sacrifices last: they are mostly refuted at once, but giving
+            # boxes away to fix the parity of the long chains can be right
+            moves = safe + unsafe
+            child = depth - 1
+            if hint >= 0 and hint in moves:
+                moves.remove(hint)
+                moves.insert(0, hint)
+
+        alpha0 = alpha
+        best, best_move = -self.box_count - 1, -1
+        for e in moves:
+            k = self._draw(e)
+            if k:
+                v = k + self._search(child, alpha - k, beta - k)
+            else:
+                v = -self._search(child, -beta, -alpha)
+            self._undraw(e)
+            if v > best:
+                best, best_move = v, e
+                if v > alpha:
+                    alpha = v
+                    if alpha >= beta:
+                        break
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        self._store(key, depth, flag, best, best_move)
+        return best
+
+    def _check_clock(self):
+        self.ops = 0
+        if ticks_diff(ticks_us(), self.slice_end) >= 0:
+            raise _Slice()
+
+    def _store(self, key, depth, flag, value, move):
+        slot = key & self.tt_mask
+        self.tt_key[slot] = key
+        self.tt_depth[slot] = depth
+        self.tt_flag[slot] = flag
+        self.tt_value[slot] = value
+        self.tt_move[slot] = move
+
+    # ---------- chain analysis ----------
+    def _components(self):
+        """
+        Sorted tuple of chains and loops (size * 2 + is_loop). Only valid
+        when every open box has exactly two sides drawn.
+        """
+        self.ops += self.scan_cost
+        sides, edges, ea, eb = self.sides, self.edges, self.edge_box_a, self.edge_box_b
+        seen = bytearray(self.box_count)
+        for b in range(self.box_count):
+            if sides[b] == 4:
+                seen[b] = 1
+        comps = []
+        # chains end on the border: start from open border edges
+        for e in range(self.edge_count):
+            if edges[e] or (ea[e] >= 0 and eb[e] >= 0):
+                continue
+            b = ea[e] if ea[e] >= 0 else eb[e]
+            if seen[b]:
+                continue
+            size = 0
+            while b >= 0:
+                seen[b] = 1
+                size += 1
+                e = self._other_edge(b, e)
+                b = self._across(e, b)
+            comps.append(size * 2)
+        # whatever is left goes round in loops
+        for start in range(self.box_count):
+            if seen[start]:
+                continue
+            b, e, size = start, -1, 0
+            while not seen[b]:
+                seen[b] = 1
+                size += 1
+                e = self._other_edge(b, e)
+                b = self._across(e, b)
+            comps.append(size * 2 + 1)
+        comps.sort()
+        return tuple(comps)
+
+    def _loony_value(self, comps):
+        """
+        Net boxes for the player who has to open one of comps next. The
+        opponent either takes all of it and moves next, or declines the last
+        two boxes of a chain (three or longer) / four of a loop and makes the
+        opener move again. Can be cut off by _Slice; finished entries stay
+        in the memo (cleared by the caller, never mid-evaluation) for the
+        retry.
+        """
+        if not comps:
+            return 0
+        memo = self.chains
+        value = memo.get(comps)
+        if value is not None:
+            return value
+        value = -self.box_count - 1
+        prev = -1
+        for i, c in enumerate(comps):
+            if c == prev:
+                continue
+            prev = c
+            rest = self._loony_value(comps[:i] + comps[i + 1:])
+            size = c >> 1
+            opp = size + rest                       # take everything
+            if c & 1:
+                opp = max(opp, size - 8 - rest)     # loop: hand back 4
+            elif size >= 3:
+                opp = max(opp, size - 4 - rest)     # chain: hand back 2
+            if -opp > value:
+                value = -opp
+        memo[comps] = value
+        # Charged once the entry is in: a retry runs back down through the
+        # memo, and every slice finishes at least one new entry
+        self.ops += len(comps)
+        if self.ops >= CHECK_OPS:
+            self._check_clock()
+        return value
@@ -0,0 +1,150 @@
+# _dnb_engine.py
+# Flat-array Dots & Boxes engine.
+# Edges and boxes are numbered once at construction; precomputed tables map
+# each edge to the (up to two) boxes it borders, and each box keeps a count of
+# drawn sides. A move is a couple of table lookups and byte writes: O(1), no
+# allocation, no try/except indexing. Rendering to the original JSON shape
+# only happens when a snapshot is needed.
+#
+# Edge numbering (n = dots per side, m = n - 1):
+#   horizontal (r, c), r < n, c < m   ->  r * m + c
+#   vertical   (r, c), r < m, c < n   ->  n * m + r * n + c
+# Box (r, c) -> r * m + c
+#
+# Python ints past 30 bits are heap-allocated on CircuitPython, so edge and
+# box sets live in bytearrays rather than integer bitmasks.
+
+from array import array
+
+MIN_SIZE = 3
+MAX_SIZE = 16   # 225 boxes; keeps box ids and scores inside a byte
+
+class DnBEngine:
+    def __init__(self, size=8):
+        size = max(MIN_SIZE, min(MAX_SIZE, size))
+        n = self.size = size
+        m = self.boxes_size = size - 1
+        self.h_edges = n * m
+        self.edge_count = 2 * n * m
+        self.box_count = m * m
+        # edge -> neighbouring boxes (-1 = none)
+        self.edge_box_a = array("h", [-1] * self.edge_count)
+        self.edge_box_b = array("h", [-1] * self.edge_count)
+        for r in range(n):
+            for c in range(m):
+                e = r * m + c
+                if r > 0:
+                    self.edge_box_a[e] = (r - 1) * m + c   # box above
+                if r < m:
+                    self.edge_box_b[e] = r * m + c         # box below
+        for r in range(m):
+            for c in range(n):
+                e = self.h_edges + r * n + c
+                if c > 0:
+                    self.edge_box_a[e] = r * m + c - 1     # box left
+                if c < m:
+                    self.edge_box_b[e] = r * m + c         # box right
+        self.edges = bytearray(self.edge_count)      # owner per edge, 0|1|2
+        self.box_owner = bytearray(self.box_count)   # owner per box, 0|1|2
+        self.box_sides = bytearray(self.box_count)   # drawn sides per box, 0..4
+        self.scores = [0, 0, 0]                      # indexed by player
+        self.current = 1
+        self.winner = 0
+        self.drawn = 0
+        # boxes completed by the last move, -1 when unused
+        self.last_a = -1
+        self.last_b = -1
+
+    def reset(self):
+        for i in range(self.edge_count):
+            self.edges[i] = 0
+        for i in range(self.box_count):
+            self.box_owner[i] = 0
+            self.box_sides[i] = 0
+        self.scores[1] = self.scores[2] = 0
+        self.current = 1
+        self.winner = 0
+        self.drawn = 0
+        self.last_a = self.last_b = -1
+
+    def edge_index(self, t, r, c):
+        """Edge id for ("h"|"v", row, col), or -1 when off the board."""
+        n, m = self.size, self.boxes_size
+        if t == "h":
+            if 0 <= r < n and 0 <= c < m:
+                return r * m + c
+        elif t == "v":
+            if 0 <= r < m and 0 <= c < n:
+                return self.h_edges + r * n + c
+        return -1
+
+    def edge_coords(self, e):
+        if e < self.h_edges:
+            return "h", e // self.boxes_size, e % self.boxes_size
+        e -= self.h_edges
+        return "v", e // self.size, e % self.size
+
+    def play(self, player, e):
+        """
+        Draws edge e for player. Returns the number of boxes it completed
+        (0..2), or -1 if the move is illegal. Completed boxes are left in
+        last_a / last_b.
+        """
+        if player != self.current or e < 0 or e >= self.edge_count or self.edges[e]:
+            return -1
+        self.edges[e] = player
+        self.drawn += 1
+        claimed = 0
+        self.last_a = self.last_b = -1
+        b = self.edge_box_a[e]
+        if b >= 0:
+            self.box_sides[b] += 1
+            if self.box_sides[b] == 4:
+                self.box_owner[b] = player
+                self.last_a = b
+                claimed += 1
+        b = self.edge_box_b[e]
+        if b >= 0:
+            self.box_sides[b] += 1
+            if self.box_sides[b] == 4:
+                self.box_owner[b] = player
+                self.last_b = b
+                claimed += 1
+        if claimed:
+            self.scores[player] += claimed
+            s1, s2 = self.scores[1], self.scores[2]
+            if s1 + s2 == self.box_count:
+                self.winner = 1 if s1 > s2 else 2 if s2 > s1 else 0
+        else:
+            # Turn swap only if no box was claimed
+            self.current = 3 - player
+        return claimed
+
+    # ---------- rendering ----------
+    def board(self):
+        """board[r][c] = [hOwner, vOwner], n x n with unused slots 0."""
+        n, m, edges, h = self.size, self.boxes_size, self.edges, self.h_edges
+        out = []
+        for r in range(n):
+            row = []
+            for c in range(n):
+                row.append([
+                    edges[r * m + c] if c < m else 0,
+                    edges[h + r * n + c] if r < m else 0,
+                ])
+            out.append(row)
+        return out
+
+    def boxes(self):
+        m, owner = self.boxes_size, self.box_owner
+        return [list(owner[r * m:(r + 1) * m]) for r in range(m)]
+
+    def state(self):
+        """The game_state dict in the original JSON shape."""
+        return {
+            "board": self.board(),
+            "boxes": self.boxes(),
+            "scores": {1: self.scores[1], 2: self.scores[2]},
+            "currentPlayer": self.current,
+            "winner": self.winner,
+        }
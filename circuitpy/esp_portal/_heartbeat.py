@@ -0,0 +1,110 @@
+# _heartbeat.py
+# Idle-socket reaper. A phone that goes to sleep rarely closes its socket, so
+# without this it holds a slot in the ESP's small socket pool until a send
+# finally fails.
+#
+# Every tracked socket carries `last_seen` (stamped by the server's Websocket
+# subclass on any frame, protocol pongs included). Sockets sit in a timing
+# wheel of one-second slots; each tick only the slots that came due are
+# looked at, never the whole socket list:
+#   quiet for PING_INTERVAL -> the owner sends a websocket ping
+#   still quiet PONG_TIMEOUT after the ping -> the owner closes the socket
+# Owners (a GameRoom, or the Hub class) provide _ping(ws) and _reap(ws).
+
+import time
+from ._metrics import METRICS
+
+class Reaper:
+    slot_s = 1.0          # wheel resolution
+    slots = 64            # longer delays are re-checked once per revolution
+
+    def __init__(self):
+        self.enabled = True
+        self.ping_s = 10
+        self.pong_s = 5
+        self.wheel = [[] for _ in range(self.slots)]
+        self.cursor = 0
+        self.last = time.monotonic()   # time the cursor slot came due
+        self.entries = {}              # ws -> [owner, time pinged or 0]
+
+    def configure(self, config):
+        cfg = (config or {}).get("HEARTBEAT", {})
+        self.enabled = cfg.get("ENABLE", self.enabled)
+        self.ping_s = cfg.get("PING_INTERVAL", self.ping_s)
+        self.pong_s = cfg.get("PONG_TIMEOUT", self.pong_s)
+
+    def track(self, ws, owner):
+        """Starts watching ws; sockets without last_seen (hub channels) are skipped."""
+        if not self.enabled or ws in self.entries or not hasattr(ws, "last_seen"):
+            return
+        ws.last_seen = time.monotonic()
+        self.entries[ws] = [owner, 0]
+        self._schedule(ws, self.ping_s)
+
+    def untrack(self, ws):
+        # Its wheel slot still holds it; _expire skips sockets with no entry
+        self.entries.pop(ws, None)
+
+    def _schedule(self, ws, delay):
+        ticks = int(delay / self.slot_s + 0.999)
+        if ticks < 1:
+            ticks = 1
+        elif ticks >= self.slots:
+            ticks = self.slots - 1
+        self.wheel[(self.cursor + ticks) % self.slots].append(ws)
+
+    def poll(self):
+        """Expires the slots that came due since the last call."""
+        if not self.entries:
+            self.last = time.monotonic()
+            return
+        now = time.monotonic()
+        steps = int((now - self.last) / self.slot_s)
+        if not steps:
+            return
+        if steps > self.slots:
+            steps = self.slots  # a long stall: every slot is due once
+        self.last += steps * self.slot_s
+        if now - self.last > self.slot_s:
+            self.last = now
+        for _ in range(steps):
+            self.cursor = (self.cursor + 1) % self.slots
+            due = self.wheel[self.cursor]
+            if due:
+                self.wheel[self.cursor] = []
+                for ws in due:
+                    self._expire(ws, now)
+
+    def _expire(self, ws, now):
+        entry = self.entries.get(ws)
+        if entry is None:
+            return
+        owner, pinged = entry
+        idle = now - ws.last_seen
+        if idle < self.ping_s:
+            entry[1] = 0
+            self._schedule(ws, self.ping_s - idle)
+            return
+        if pinged and ws.last_seen < pinged:
+            waited = now - pinged
+            if waited >= self.pong_s:
+                del self.entries[ws]
+                METRICS.incr("reaped_idle")
+                print("Reaping idle client:", ws)
+                try:
+                    owner._reap(ws)
+                except Exception as e:
+                    print("Reap error:", e)
+            else:
+                self._schedule(ws, self.pong_s - waited)
+            return
+        entry[1] = now
+        METRICS.incr("heartbeat_pings")
+        try:
+            owner._ping(ws)
+        except Exception:
+            pass  # the pong deadline still applies
+        self._schedule(ws, self.pong_s)
+
+
+REAPER = Reaper()
@@ -0,0 +1,232 @@
+# _hub.py
+# One websocket carrying every game (GET /ws).
+# Text frames are "<channel>:<payload>". Channel 0 is control:
+#   -> 0:{"type":"open","ch":3,"game":"dots-and-boxes","room":"abc","proto":"delta"}
+#   <- 0:{"type":"opened","ch":3}   or   0:{"type":"error","ch":3,"error":"..."}
+#   -> 0:{"type":"close","ch":3}    <- 0:{"type":"closed","ch":3}
+#   -> 0:{"type":"ping"}            <- 0:{"type":"pong"}
+# Binary frames carry the channel id in their first byte instead, so
+# ?proto=bin channels keep the _wire layout over the hub.
+# Each open channel is handed to the game as a Channel, which looks like a
+# Websocket to GameRoom, so the games need no hub-specific code.
+# Outgoing frames from all channels share one Outbox sized for every
+# channel; a hub client that still overflows it is disconnected. The hub
+# socket itself is what REAPER pings and reaps.
+
+import json
+from ._metrics import METRICS, ticks_us
+from ._outbox import Outbox, QUEUED, PING
+from ._heartbeat import REAPER
+
+class Channel:
+    """Per-game view of a hub socket: receive() drains an inbox, send_message() prefixes the id."""
+
+    def __init__(self, session, ch, game):
+        self.session = session
+        self.ch = ch
+        self.game = game
+        self.prefix = str(ch) + ":"
+        self.byte_prefix = bytes((ch,))
+        self.inbox = []
+        self.closed = False
+
+    def receive(self):
+        if self.closed:
+            raise OSError("channel closed")
+        if self.inbox:
+            return self.inbox.pop(0)
+        return None
+
+    def send_message(self, data):
+        if self.closed:
+            raise OSError("channel closed")
+        if isinstance(data, str):
+            self.session.send(self.prefix + data)
+        else:
+            self.session.send(self.byte_prefix + data)
+
+    def close(self):
+        # Game dropped this channel; tell the client unless the hub socket is gone
+        if not self.closed:
+            self.closed = True
+            self.session.close_channel(self.ch, notify=True)
+
+    def __repr__(self):
+        return f"<Channel {self.ch} {self.game.__name__}>"
+
+
+class HubSession:
+    def __init__(self, ws):
+        self.ws = ws
+        self.channels = {}
+        self.outbox = None
+        self.dead = False
+        if getattr(ws, "_request", None) is not None:
+            self.outbox = Outbox(ws, Outbox.max_frames * Hub.max_channels)
+
+    def send(self, data, opcode=None):
+        if self.outbox is None:
+            self.ws.send_message(data)
+        elif self.dead or self.outbox.push(data, False, opcode) != QUEUED:
+            # Frames for several channels were lost; make the client reconnect
+            self.dead = True
+            raise OSError("hub client too slow")
+
+    def control(self, payload):
+        self.send("0:" + json.dumps(payload))
+
+    def open_channel(self, ch, name, room, proto=None):
+        game = Hub.games.get(name)
+        if not isinstance(ch, int) or not 0 < ch < 256:
+            return self.control({"type": "error", "ch": ch, "error": "bad channel"})
+        if game is None:
+            return self.control({"type": "error", "ch": ch, "error": "unknown game"})
+        if ch in self.channels or len(self.channels) >= Hub.max_channels:
+            return self.control({"type": "error", "ch": ch, "error": "channel unavailable"})
+        channel = self.channels[ch] = Channel(self, ch, game)
+        game.handle_ws(channel, room, proto)
+        self.control({"type": "opened", "ch": ch})
+
+    def close_channel(self, ch, notify=False):
+        channel = self.channels.pop(ch, None)
+        if channel is None:
+            return
+        channel.closed = True  # the room drops it on its next read
+        if notify:
+            try:
+                self.control({"type": "closed", "ch": ch})
+            except Exception:
+                pass
+
+    def close(self):
+        for ch in tuple(self.channels):
+            self.close_channel(ch)
+        try:
+            if self.outbox is not None and (self.dead or self.outbox.pending):
+                self.outbox.abort()  # a close frame would wait behind the queue
+            else:
+                self.ws.close()
+        except Exception:
+            pass
+
+    def dispatch_binary(self, msg):
+        channel = self.channels.get(msg[0]) if msg else None
+        if channel is None:
+            return
+        if len(channel.inbox) >= Hub.max_inbox:
+            METRICS.incr("hub_inbox_overflow")
+            return
+        channel.inbox.append(bytes(msg[1:]))
+
+    def dispatch(self, msg):
+        if msg == "ping":  # bare keepalive some clients send
+            self.send("pong")
+            return
+        i = msg.find(":")
+        if i <= 0 or not msg[:i].isdigit():
+            return
+        ch = int(msg[:i])
+        payload = msg[i + 1:]
+        if ch:
+            channel = self.channels.get(ch)
+            if channel is None:
+                return
+            if len(channel.inbox) >= Hub.max_inbox:
+                METRICS.incr("hub_inbox_overflow")
+                return
+            channel.inbox.append(payload)
+            return
+        try:
+            data = json.loads(payload)
+        except Exception:
+            return
+        if not isinstance(data, dict):
+            return
+        mtype = data.get("type")
+        if mtype == "open":
+            self.open_channel(data.get("ch"), data.get("game"), data.get("room"), data.get("proto"))
+        elif mtype == "close":
+            self.close_channel(data.get("ch"), notify=True)
+        elif mtype == "ping":
+            self.control({"type": "pong"})
+
+
+class Hub:
+    # One session per hub socket; the Scheduler treats a non-empty `rooms`
+    # as live, same as the game classes.
+    rooms = {}
+    games = {}            # "dots-and-boxes" -> DotsAndBoxes, ...
+    max_channels = 8      # per hub socket
+    max_inbox = 16        # queued frames per channel before dropping
+    frames_per_tick = 8   # frames read from one hub socket per poll
+
+    @classmethod
+    def configure(cls, config, games):
+        cfg = (config or {}).get("HUB", {})
+        cls.games = games
+        cls.max_channels = cfg.get("MAX_CHANNELS", cls.max_channels)
+        cls.max_inbox = cfg.get("MAX_INBOX", cls.max_inbox)
+        cls.frames_per_tick = cfg.get("FRAMES_PER_TICK", cls.frames_per_tick)
+
+    @classmethod
+    def client_count(cls):
+        return len(cls.rooms)
+
+    @classmethod
+    def handle_ws(cls, ws, room=None, proto=None):
+        cls.rooms[ws] = HubSession(ws)
+        REAPER.track(ws, cls)
+
+    @classmethod
+    def _drop(cls, ws):
+        session = cls.rooms.pop(ws, None)
+        if session is not None:
+            session.close()
+        REAPER.untrack(ws)
+
+    # ---------- heartbeat (called by REAPER) ----------
+    @classmethod
+    def _ping(cls, ws):
+        session = cls.rooms.get(ws)
+        if session is not None:
+            session.send(b"", PING)
+
+    @classmethod
+    def _reap(cls, ws):
+        cls._drop(ws)
+        METRICS.incr("dropped_sockets")
+
+    @classmethod
+    def poll(cls):
+        """
+        Reads frames from every hub socket into its channels' inboxes.
+        Polled before the games so routed frames are handled the same tick.
+        """
+        handled = 0
+        now = ticks_us()
+        for ws, session in tuple(cls.rooms.items()):
+            box = session.outbox
+            if session.dead or (box is not None and box.pending and box.drain(now) < 0):
+                cls._drop(ws)
+                METRICS.incr("evicted_slow")
+                print("Evicting slow hub client:", ws)
+                continue
+            for _ in range(cls.frames_per_tick):
+                try:
+                    msg = ws.receive()
+                except Exception:
+                    cls._drop(ws)
+                    METRICS.incr("dropped_sockets")
+                    print("Hub Disconnected:", ws)
+                    break
+                if not msg:
+                    break
+                handled += 1
+                try:
+                    if isinstance(msg, str):
+                        session.dispatch(msg)
+                    else:
+                        session.dispatch_binary(msg)
+                except Exception as e:
+                    print("Hub frame error:", e)
+        return handled
@@ -0,0 +1,113 @@
+# _metrics.py
+# Low-overhead counters and fixed-bucket histograms for the server loop.
+# Histograms are fixed-size lists of bucket counts, so recording is a handful
+# of int ops; /api/metrics serialises a snapshot on demand.
+
+import time
+
+try:
+    from supervisor import ticks_ms as _ticks_ms
+except ImportError:
+    _ticks_ms = None  # host Python
+
+# Microsecond ticks wrap every TICKS_PERIOD so they stay small ints; anything
+# past 30 bits is a heap-allocated long on CircuitPython, and monotonic_ns()
+# always is. Take differences with ticks_diff() and build deadlines with
+# ticks_add(), never plain - / + / >= (adafruit_ticks style).
+TICKS_PERIOD = 0x80000 * 1000  # 524288 ms, ~8.7 minutes
+_TICKS_HALF = TICKS_PERIOD // 2
+
+if _ticks_ms is not None:
+    def ticks_us():
+        # The board clock counts milliseconds and wraps at 2**29, which
+        # 2**19 divides, so masking keeps the sequence continuous.
+        return (_ticks_ms() & 0x7FFFF) * 1000
+else:
+    def ticks_us():
+        return time.monotonic_ns() // 1000 % TICKS_PERIOD
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) % TICKS_PERIOD
+
+
+def ticks_diff(end, start):
+    """Signed end - start in microseconds; good for gaps under ~4 minutes."""
+    return (end - start + _TICKS_HALF) % TICKS_PERIOD - _TICKS_HALF
+
+
+# Bucket upper bounds; the last bucket counts everything above the last bound.
+TIME_BUCKETS_US = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32)
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        i = 0
+        for bound in self.bounds:
+            if value <= bound:
+                break
+            i += 1
+        self.counts[i] += 1
+
+    def to_dict(self):
+        buckets = {str(b): c for b, c in zip(self.bounds, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max,
+            "mean": self.total // self.count if self.count else 0,
+            "buckets": buckets,
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = True
+        self.started = time.monotonic()
+        self.counters = {}
+        self.histograms = {}
+
+    def configure(self, config):
+        self.enabled = (config or {}).get("METRICS", {}).get("ENABLE", True)
+
+    def histogram(self, name, bounds=TIME_BUCKETS_US):
+        h = self.histograms.get(name)
+        if h is None:
+            h = self.histograms[name] = Histogram(bounds)
+        return h
+
+    def observe(self, name, value, bounds=TIME_BUCKETS_US):
+        if self.enabled:
+            self.histogram(name, bounds).observe(value)
+
+    def incr(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        return {
+            "uptime_s": int(time.monotonic() - self.started),
+            "counters": dict(self.counters),
+            "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+        }
+
+    def reset(self):
+        self.counters = {}
+        self.histograms = {}
+
+
+# Shared by the scheduler, the game classes and the /api/metrics route
+METRICS = Metrics()
@@ -0,0 +1,120 @@
+# _outbox.py
+# Bounded per-socket send queue drained with non-blocking send().
+# adafruit_httpserver's Websocket.send_message() spins on EAGAIN until the
+# whole frame is out, so one phone with a weak signal stalls the loop for
+# every game. An Outbox frames the message itself, writes what the socket
+# takes right now and keeps the rest for the next tick.
+#
+# Slow consumers: a full snapshot supersedes everything queued behind the
+# frame in flight; when the queue overflows it is cleared and the caller is
+# told to resync the client; a client that overflows repeatedly, or makes no
+# progress for STALL_MS, is evicted.
+
+from errno import EAGAIN
+from ._metrics import METRICS, ticks_diff, ticks_us
+
+# push() results
+QUEUED = 0
+OVERFLOW = 1   # queue cleared; caller should resend a snapshot
+EVICT = 2      # client can't keep up; caller should drop it
+
+TEXT = 0x1
+BINARY = 0x2
+PING = 0x9
+
+class Outbox:
+    max_frames = 8        # queued frames per socket
+    max_overflows = 3     # overflows before eviction (reset when drained)
+    stall_us = 3000000    # no progress for this long -> eviction
+
+    def __init__(self, ws, max_frames=None):
+        self.ws = ws
+        if max_frames is not None:
+            self.max_frames = max_frames
+        self.conn = ws._request.connection
+        self.frames = []        # framed messages not yet started
+        self.view = None        # memoryview of the frame in flight
+        self.sent = 0           # bytes of it already written
+        self.overflows = 0
+        self.last_progress = ticks_us()
+
+    @classmethod
+    def configure(cls, config):
+        cfg = (config or {}).get("OUTBOX", {})
+        cls.max_frames = cfg.get("MAX_FRAMES", cls.max_frames)
+        cls.max_overflows = cfg.get("MAX_OVERFLOWS", cls.max_overflows)
+        cls.stall_us = int(cfg.get("STALL_MS", cls.stall_us // 1000) * 1000)
+
+    @property
+    def pending(self):
+        return self.view is not None or bool(self.frames)
+
+    def push(self, message, snapshot=False, opcode=None):
+        """
+        Queues one message and tries to send it straight away.
+        snapshot=True marks a full state that makes queued messages stale.
+        Returns QUEUED, OVERFLOW or EVICT.
+        """
+        if opcode is not None:
+            frame = self.ws._prepare_frame(opcode, message)
+        elif isinstance(message, str):
+            frame = self.ws._prepare_frame(TEXT, message.encode())
+        else:
+            frame = self.ws._prepare_frame(BINARY, message)
+        if snapshot:
+            if self.frames:
+                METRICS.incr("outbox_superseded", len(self.frames))
+                self.frames = []
+        elif len(self.frames) >= self.max_frames:
+            METRICS.incr("outbox_overflows")
+            self.frames = []
+            self.overflows += 1
+            if self.overflows > self.max_overflows:
+                return EVICT
+            return OVERFLOW  # dropped with the rest; a snapshot resyncs the client
+        self.frames.append(frame)
+        if self.drain() < 0:
+            return EVICT
+        return QUEUED
+
+    def drain(self, now=None):
+        """
+        Writes as much as the socket accepts without blocking.
+        Returns 1 if bytes went out, 0 if nothing could be sent, -1 if
+        the connection failed or stalled past STALL_MS.
+        """
+        progress = 0
+        while True:
+            if self.view is None:
+                if not self.frames:
+                    self.overflows = 0   # caught up
+                    break
+                self.view = memoryview(self.frames.pop(0))
+                self.sent = 0
+            try:
+                n = self.conn.send(self.view[self.sent:])
+            except OSError as exc:
+                if exc.errno == EAGAIN:
+                    break
+                return -1
+            if not n:
+                break
+            progress = 1
+            self.sent += n
+            if self.sent >= len(self.view):
+                self.view = None
+        if now is None:
+            now = ticks_us()
+        if progress:
+            self.last_progress = now
+        elif self.pending and ticks_diff(now, self.last_progress) > self.stall_us:
+            METRICS.incr("outbox_stalled")
+            return -1
+        return progress
+
+    def abort(self):
+        """Drops the connection without a close frame (one may be mid-frame)."""
+        self.frames = []
+        self.view = None
+        self.ws.closed = True
+        self.ws._close_connection()
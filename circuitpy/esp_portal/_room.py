@@ -0,0 +1,412 @@
+# _room.py
+# Shared websocket lifecycle for the game managers.
+# Every game keeps its sessions in a dict of rooms keyed by the ?room= query
+# value. A room owns its sockets and its game state, so a move is serialized
+# once and sent only to that room; a room is freed as soon as it empties.
+#
+# Sockets opened with ?proto=delta get {"type":"delta","seq":n,...} after a
+# move instead of the whole state. Every broadcast bumps the room's seq, and
+# full "state" messages carry it too; a client that sees a gap sends
+# {"type":"sync"} and gets a fresh snapshot.
+#
+# Sends go through a per-socket Outbox (see _outbox.py), so a slow phone
+# only delays itself; hub channels are queued by their hub session instead.
+# Client pings are answered with a pong, and REAPER (see _heartbeat.py)
+# pings quiet sockets and closes the ones that stop answering.
+#
+# Sockets opened with ?proto=bin (or the _wire.SUBPROTOCOL subprotocol) get
+# the same messages in the fixed binary layout from _wire; binary frames
+# from any client are decoded into the same dicts as the JSON schemas.
+
+import json
+from . import _wire
+from ._metrics import METRICS, ticks_add, ticks_diff, ticks_us
+from ._outbox import Outbox, OVERFLOW, EVICT, PING
+from ._heartbeat import REAPER
+
+DEFAULT_ROOM = "default"
+PONG_JSON = json.dumps({"type": "pong"})
+PONG_BIN = bytes((_wire.PONG,))
+
+class GameRoom:
+    # Subclasses declare their own `rooms = {}` (room name -> instance)
+    rooms = None
+    max_rooms = 8     # per game; extra rooms fall back to DEFAULT_ROOM
+    name_len = 16     # longer room names are truncated
+    frame_budget = 16         # frames read per room per tick
+    time_budget_us = 5000     # per game per tick; every room still gets one pass
+    # Subclasses provide game_state (a dict or a property rendering one)
+    game_state = None
+
+    def __init__(self, room=DEFAULT_ROOM):
+        self.room = room
+        # Live sockets + sockets that need their first state send on next poll
+        self.ws_clients = set()
+        self.ws_needs_init = set()
+        self.ws_delta = set()    # sockets that asked for delta broadcasts
+        self.ws_binary = set()   # sockets on the binary wire format (always delta)
+        self.seq = 0
+        self.delta = None        # set by _handle() when a change fits a delta
+        # Changes are marked here and pushed once at the end of the tick
+        self.dirty = False
+        self.pending = None      # delta to send, None = full state
+        self.pending_n = 0       # changes folded into the next push
+        # Encoded snapshot cache, valid while seq and the client count match
+        self._snap_seq = -1
+        self._snap_count = -1
+        self._snap_json = None
+        self._snap_bin = None
+        self._rr = 0             # round-robin start offset, advances every tick
+        self.outboxes = {}       # ws -> Outbox, created on first send
+
+    @classmethod
+    def configure(cls, config):
+        cfg = (config or {}).get("ROOMS", {})
+        GameRoom.max_rooms = cfg.get("MAX_PER_GAME", GameRoom.max_rooms)
+        GameRoom.name_len = cfg.get("NAME_LEN", GameRoom.name_len)
+        GameRoom.frame_budget = cfg.get("FRAME_BUDGET", GameRoom.frame_budget)
+        GameRoom.time_budget_us = int(cfg.get("TIME_BUDGET_MS", GameRoom.time_budget_us / 1000) * 1000)
+
+    # ---------- rooms ----------
+    @classmethod
+    def get_room(cls, room=DEFAULT_ROOM):
+        room = str(room)[:cls.name_len] if room else DEFAULT_ROOM
+        inst = cls.rooms.get(room)
+        if inst is None:
+            if room != DEFAULT_ROOM and len(cls.rooms) >= cls.max_rooms:
+                print(f"{cls.__name__}: room limit reached, {room!r} joins {DEFAULT_ROOM!r}")
+                return cls.get_room(DEFAULT_ROOM)
+            inst = cls.rooms[room] = cls(room)
+        return inst
+
+    @classmethod
+    def client_count(cls):
+        return sum(len(inst.ws_clients) for inst in cls.rooms.values())
+
+    # ---------- websocket lifecycle ----------
+    @classmethod
+    def handle_ws(cls, ws, room=None, proto=None):
+        """
+        Called from route after creating Websocket(request).
+        We don't send immediately—some stacks will drop a frame
+        sent in the same handler. We queue it for the next poll().
+        """
+        inst = cls.get_room(room)
+        inst.ws_clients.add(ws)
+        inst.ws_needs_init.add(ws)  # send state on next poll tick
+        if proto == "delta":
+            inst.ws_delta.add(ws)
+        elif proto == "bin":
+            inst.ws_binary.add(ws)
+        REAPER.track(ws, inst)
+        return inst
+
+    @classmethod
+    def on_disconnect(cls, ws):
+        for inst in cls.rooms.values():
+            inst._drop(ws)
+
+    def _drop(self, ws):
+        if ws in self.ws_clients or ws in self.ws_needs_init:
+            self.ws_clients.discard(ws)
+            self.ws_needs_init.discard(ws)
+            self.ws_delta.discard(ws)
+            self.ws_binary.discard(ws)
+            self.outboxes.pop(ws, None)
+            REAPER.untrack(ws)
+            print("Client Disconnected:", ws)
+
+    def _close(self, ws):
+        box = self.outboxes.get(ws)
+        try:
+            if box is not None and box.pending:
+                box.abort()  # a close frame would wait behind the queue
+            else:
+                ws.close()
+        except Exception:
+            pass
+        if ws in self.ws_clients or ws in self.ws_needs_init:
+            METRICS.incr("dropped_sockets")
+        self._drop(ws)
+
+    def _evict(self, ws):
+        METRICS.incr("evicted_slow")
+        print("Evicting slow client:", ws)
+        self._close(ws)
+
+    def _send(self, ws, data, snapshot=False, opcode=None):
+        """
+        Queues data on the socket's Outbox and writes what it takes now.
+        snapshot=True lets a full state replace stale queued messages.
+        Returns False if the client was evicted or dropped.
+        """
+        box = self.outboxes.get(ws)
+        if box is None:
+            if getattr(ws, "_request", None) is None:
+                # hub Channel: the session queues it, and raises once the
+                # hub client has fallen too far behind or is gone
+                try:
+                    ws.send_message(data)
+                except Exception:
+                    self._close(ws)
+                    return False
+                return True
+            box = self.outboxes[ws] = Outbox(ws)
+        result = box.push(data, snapshot, opcode)
+        if result == EVICT:
+            self._evict(ws)
+            return False
+        if result == OVERFLOW:
+            self.ws_needs_init.add(ws)  # fell behind: resync with a snapshot
+        return True
+
+    # ---------- heartbeat (called by REAPER) ----------
+    def _ping(self, ws):
+        self._send(ws, b"", opcode=PING)
+
+    def _reap(self, ws):
+        self._close(ws)
+
+    # ---------- main poll loop ----------
+    @classmethod
+    def poll(cls):
+        """
+        Call from the main server loop (after server.poll()).
+        Services every room and frees the ones left without sockets.
+        Returns the number of frames handled so the scheduler can tell
+        a busy tick from an idle one.
+        """
+        handled = 0
+        deadline = ticks_add(ticks_us(), cls.time_budget_us)
+        for room, inst in tuple(cls.rooms.items()):
+            handled += inst._poll(deadline)
+            if not inst.ws_clients and not inst.ws_needs_init:
+                del cls.rooms[room]
+                METRICS.incr("rooms_freed")
+        return handled
+
+    def _poll(self, deadline):
+        """
+        - Sends initial state to new sockets.
+        - Drains inbound frames within the tick budget and applies moves.
+        - Broadcasts state after changes.
+        """
+        handled = 0
+
+        # 0) Push out whatever slow sockets still have queued
+        if self.outboxes:
+            now = ticks_us()
+            for ws, box in tuple(self.outboxes.items()):
+                if box.pending:
+                    if box.drain(now) < 0:
+                        self._evict(ws)
+                    else:
+                        handled += 1  # keep the scheduler awake while queues drain
+
+        # 1) Send initial state to sockets that just upgraded
+        if self.ws_needs_init:
+            for ws in tuple(self.ws_needs_init):
+                # either way, don't try to init twice
+                self.ws_needs_init.discard(ws)
+                try:
+                    data = self._snapshot_for(ws)
+                    t0 = ticks_us()
+                    self._send(ws, data, True)
+                    METRICS.observe("send_message_us", ticks_diff(ticks_us(), t0))
+                    handled += 1
+                except Exception:
+                    self._close(ws)
+
+        # 2) Service sockets round-robin: one frame from each socket per pass,
+        # passes repeat for the sockets that still had data until the frame
+        # budget or the tick deadline runs out. A burst from one client can't
+        # starve the others, and queued moves don't wait a tick per frame.
+        live = list(self.ws_clients)
+        if len(live) > 1:
+            k = self._rr % len(live)
+            live = live[k:] + live[:k]
+            self._rr += 1
+        frames = 0
+        while live:
+            busy = []
+            for ws in live:
+                # Read one frame (non-blocking; returns None if none)
+                try:
+                    msg = ws.receive()
+                except Exception:
+                    # Treat read errors as disconnects
+                    self._close(ws)
+                    continue
+                if not msg:
+                    # No frame available (None or empty string); quiet this tick
+                    continue
+                frames += 1
+                busy.append(ws)
+                self._dispatch(ws, msg)
+                if frames >= self.frame_budget:
+                    break
+            if frames >= self.frame_budget or ticks_diff(ticks_us(), deadline) >= 0:
+                if busy:
+                    METRICS.incr("budget_exhausted")
+                break
+            live = busy
+
+        # 3) Room-side work no socket drives (a computer player's turn)
+        handled += self._tick()
+
+        # 4) One push per room per tick, however many changes came in
+        if self.dirty:
+            self._flush()
+
+        return handled + frames
+
+    def _dispatch(self, ws, msg):
+        if msg == "ping":  # bare keepalive some clients send
+            self._send(ws, "pong")
+            return
+        # Process message safely
+        try:
+            if isinstance(msg, str):
+                data = json.loads(msg)
+            else:
+                data = _wire.decode_client(msg)
+        except Exception:
+            data = None
+
+        if not isinstance(data, dict):
+            # Unknown/invalid frame
+            return
+
+        mtype = data.get("type")
+        if mtype == "ping":
+            self._send(ws, PONG_BIN if ws in self.ws_binary else PONG_JSON)
+            return
+
+        if mtype == "sync":
+            # Client saw a seq gap; it gets a fresh snapshot at the start of
+            # the next tick, after this tick's changes have been pushed
+            self.ws_needs_init.add(ws)
+            return
+
+        self.delta = None
+        if self._handle(data):
+            self._mark(self.delta)
+
+    def _mark(self, delta):
+        """Records a state change for the end-of-tick push."""
+        self.pending_n += 1
+        if not self.dirty:
+            self.dirty = True
+            self.pending = delta
+        elif (delta is not None and self.pending is not None
+              and "e" not in delta and "e" not in self.pending):
+            self.pending = delta  # count-only updates: the latest one wins
+        else:
+            self.pending = None   # several moves: one full state covers them
+
+    def _flush(self):
+        coalesced = self.pending_n - 1
+        if coalesced:
+            METRICS.incr("coalesced_sends", coalesced * len(self.ws_clients))
+        delta = self.pending
+        self.dirty = False
+        self.pending = None
+        self.pending_n = 0
+        self._broadcast(delta)
+
+    def _tick(self):
+        """
+        Per-tick hook for work that isn't a client message. May change state
+        and _mark() it like _handle does; returns units of work done so the
+        scheduler stays awake while there is more.
+        """
+        return 0
+
+    def _handle(self, data):
+        """
+        Applies one decoded client message; returns True if state changed.
+        May set self.delta to a small dict describing the change for
+        delta clients; left as None, everyone gets the full state.
+        """
+        raise NotImplementedError
+
+    # ---------- broadcast ----------
+    def _state_message(self):
+        payload = {"type": "state", "seq": self.seq}
+        payload.update(self.game_state)
+        payload["count"] = len(self.ws_clients) - 1  # exclude dashboard
+        return json.dumps(payload)
+
+    def _snapshot(self, binary=False):
+        """
+        Encoded full state, built at most once per (seq, client count) and
+        shared by init sends, syncs and full-state broadcasts. seq only moves
+        on accepted changes, so a burst of joins serializes once.
+        """
+        count = len(self.ws_clients)
+        if self._snap_seq != self.seq or self._snap_count != count:
+            self._snap_seq = self.seq
+            self._snap_count = count
+            self._snap_json = self._snap_bin = None
+        data = self._snap_bin if binary else self._snap_json
+        if data is not None:
+            METRICS.incr("snapshot_hits")
+            return data
+        t0 = ticks_us()
+        if binary:
+            data = self._snap_bin = _wire.encode_state(self.seq, self.game_state, count - 1)
+            METRICS.observe("wire_encode_us", ticks_diff(ticks_us(), t0))
+        else:
+            data = self._snap_json = self._state_message()
+            METRICS.observe("json_dumps_us", ticks_diff(ticks_us(), t0))
+        METRICS.incr("snapshot_builds")
+        return data
+
+    def _snapshot_for(self, ws):
+        return self._snapshot(ws in self.ws_binary)
+
+    def _delta_message(self, delta):
+        payload = {"type": "delta", "seq": self.seq}
+        payload.update(delta)
+        return json.dumps(payload)
+
+    def _broadcast(self, delta=None):
+        self.seq += 1
+        METRICS.incr("broadcasts")
+        # Each message kind is serialized at most once, and only if some
+        # socket in the room needs it; full states go through the snapshot
+        # cache so later joins and syncs reuse them.
+        state = small = packed = None
+        dead = []
+        for ws in tuple(self.ws_clients):
+            snapshot = delta is None
+            if ws in self.ws_binary:
+                if packed is None:
+                    if delta is None:
+                        packed = self._snapshot(True)
+                    else:
+                        t0 = ticks_us()
+                        packed = _wire.encode_delta(self.seq, delta)
+                        METRICS.observe("wire_encode_us", ticks_diff(ticks_us(), t0))
+                data = packed
+            elif delta is not None and ws in self.ws_delta:
+                if small is None:
+                    t0 = ticks_us()
+                    small = self._delta_message(delta)
+                    METRICS.observe("json_dumps_us", ticks_diff(ticks_us(), t0))
+                data = small
+            else:
+                if state is None:
+                    state = self._snapshot()
+                data = state
+                snapshot = True
+            t0 = ticks_us()
+            try:
+                if self._send(ws, data, snapshot):
+                    METRICS.incr("broadcast_bytes", len(data))
+            except Exception:
+                dead.append(ws)
+            METRICS.observe("send_message_us", ticks_diff(ticks_us(), t0))
+
+        for ws in dead:
+            self._close(ws)
@@ -0,0 +1,80 @@
+# _scheduler.py
+# Adaptive tick scheduler for ESPServer.
+# Only services games that hold sockets and sizes the sleep to the load:
+# no sleep while frames are flowing, a short MIN_SLEEP linger after each burst
+# (replies tend to follow a move closely), then exponential back-off.
+
+from ._metrics import METRICS, COUNT_BUCKETS, ticks_diff, ticks_us
+
+class Scheduler:
+    def __init__(self, poll_http, games, config=None, background=()):
+        """
+        poll_http:  callable that services HTTP/WS handshakes and returns
+                    True when it handled a request.
+        games:      GameRoom classes; `rooms` is empty when nothing is
+                    connected and poll() returns the number of frames handled.
+        background: cheap callables run once per tick after the games
+                    (e.g. Leader_Board.maybe_flush); they don't count as work.
+        """
+        cfg = (config or {}).get("SCHEDULER", {})
+        self.min_sleep = cfg.get("MIN_SLEEP", 0.001)   # first back-off step
+        self.max_sleep = cfg.get("MAX_SLEEP", 0.01)    # cap while sockets are live
+        self.idle_sleep = cfg.get("IDLE_SLEEP", 0.05)  # cap when nothing is connected
+        self.linger = cfg.get("LINGER", 0.1)           # stay at MIN_SLEEP this long after work
+        self.poll_http = poll_http
+        self.games = games
+        self.background = list(background)
+        self._poll_keys = [f"game_poll_us.{g.__name__}" for g in games]
+        self._sleep = self.min_sleep
+        self._quiet = 0.0  # seconds slept since the last tick that did work
+
+    def tick(self):
+        """
+        Run one pass of the server loop.
+        Returns the number of seconds the caller should sleep (0 = go again).
+        """
+        metrics = METRICS.enabled
+        t0 = ticks_us() if metrics else 0
+        work = 1 if self.poll_http() else 0
+        if metrics:
+            METRICS.observe("http_poll_us", ticks_diff(ticks_us(), t0))
+        live = False
+        frames = 0
+        for i, g in enumerate(self.games):
+            if g.rooms:  # empty rooms are freed, so any room means live sockets
+                live = True
+                if metrics:
+                    t0 = ticks_us()
+                frames += g.poll() or 0
+                if metrics:
+                    METRICS.observe(self._poll_keys[i], ticks_diff(ticks_us(), t0))
+        for task in self.background:
+            try:
+                task()
+            except Exception as e:
+                print("Background task error:", e)
+        if metrics:
+            METRICS.incr("ticks")
+            if live:
+                METRICS.observe("frames_per_tick", frames, COUNT_BUCKETS)
+        return self._next_sleep(work + frames, live)
+
+    def _next_sleep(self, work, live):
+        if work:
+            # Frames are flowing: go straight into the next tick and restart
+            # the back-off ladder from the bottom once things settle.
+            self._sleep = self.min_sleep
+            self._quiet = 0.0
+            return 0
+        if live and self._quiet < self.linger:
+            # Sockets are open and something just happened: keep the poll
+            # interval short so the answer to a move isn't held behind a
+            # 10 ms nap. Counting slept time avoids a clock read per tick.
+            self._quiet += self.min_sleep
+            return self.min_sleep
+        delay = self._sleep
+        cap = self.max_sleep if live else self.idle_sleep
+        if delay > cap:
+            delay = cap
+        self._sleep = min(delay * 2, cap)
+        return delay
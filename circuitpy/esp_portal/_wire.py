@@ -0,0 +1,200 @@
+# _wire.py
+# Binary encoding of the board games (?proto=bin or the "game.bin.v1"
+# websocket subprotocol). Every game room shares the Dots & Boxes state shape,
+# so one layout covers them all. Integers are big-endian.
+#
+# Server -> client
+#   STATE  0x01 seq:u32 size:u8 turn:u8 winner:u8 s1:u8 s2:u8 count:i8
+#               turn = player | ai<<2 | level<<4 (computer's seat and
+#               1 + its index in AI_LEVELS, both 0 without one)
+#               h edges (size rows x size-1), v edges (size-1 rows x size),
+#               boxes (size-1 x size-1); row-major, 2 bits per cell, the
+#               first cell in the high bits of each byte
+#   DELTA  0x02 seq:u32 flags:u8 r:u8 c:u8 s1:u8 s2:u8 n:u8 n x (r:u8 c:u8)
+#               flags = v | owner<<1 | player<<3 | winner<<5
+#   COUNT  0x03 seq:u32 count:i8                    (delta after a join)
+#   PONG   0x04                                      (answer to PING)
+# Client -> server
+#   MOVE   0x10 flags:u8 r:u8 c:u8    flags = v | player<<1 (0 = whoever's turn)
+#   RESET  0x11
+#   SYNC   0x12
+#   JOIN   0x13 player:u8
+#   PING   0x14
+# Client frames decode to the same dicts the JSON schemas produce, so rooms
+# handle both encodings with one code path.
+
+import struct
+
+SUBPROTOCOL = "game.bin.v1"
+
+STATE = 0x01
+DELTA = 0x02
+COUNT = 0x03
+PONG = 0x04
+MOVE = 0x10
+RESET = 0x11
+SYNC = 0x12
+JOIN = 0x13
+PING = 0x14
+
+AI_LEVELS = ("easy", "medium", "hard")
+
+STATE_HEAD = ">BIBBBBBb"
+DELTA_HEAD = ">BIBBBBBB"
+COUNT_MSG = ">BIb"
+STATE_HEAD_SIZE = struct.calcsize(STATE_HEAD)
+DELTA_HEAD_SIZE = struct.calcsize(DELTA_HEAD)
+
+
+def _pack2(values, out, pos):
+    """Packs 0..3 values four to a byte into out[pos:]; returns the new pos."""
+    acc = 0
+    n = 0
+    for v in values:
+        acc = (acc << 2) | v
+        n += 1
+        if n == 4:
+            out[pos] = acc
+            pos += 1
+            acc = n = 0
+    if n:
+        out[pos] = acc << (2 * (4 - n))
+        pos += 1
+    return pos
+
+
+def _unpack2(buf, pos, count):
+    values = []
+    shift = 6
+    while len(values) < count:
+        values.append((buf[pos] >> shift) & 3)
+        if shift:
+            shift -= 2
+        else:
+            shift = 6
+            pos += 1
+    return values, pos + (1 if shift != 6 else 0)
+
+
+def state_size(size):
+    cells = 2 * size * (size - 1) + (size - 1) * (size - 1)
+    return STATE_HEAD_SIZE + (cells + 3) // 4
+
+
+# ---------- server -> client ----------
+def encode_state(seq, state, count):
+    board = state["board"]
+    boxes = state["boxes"]
+    size = len(board)
+    scores = state["scores"]
+    out = bytearray(state_size(size))
+    count = max(-128, min(127, count))
+    turn = state["currentPlayer"]
+    ai = state.get("ai", 0)
+    if ai:
+        level = state.get("aiLevel")
+        turn |= ai << 2 | (AI_LEVELS.index(level) + 1 if level in AI_LEVELS else 0) << 4
+    struct.pack_into(STATE_HEAD, out, 0, STATE, seq & 0xFFFFFFFF, size,
+                     turn, state["winner"], scores[1], scores[2], count)
+    pos = _pack2([board[r][c][0] for r in range(size) for c in range(size - 1)], out, STATE_HEAD_SIZE)
+    pos = _pack2([board[r][c][1] for r in range(size - 1) for c in range(size)], out, pos)
+    _pack2([v for row in boxes for v in row], out, pos)
+    return bytes(out)
+
+
+def encode_delta(seq, delta):
+    seq &= 0xFFFFFFFF
+    edge = delta.get("e")
+    if edge is None:
+        return struct.pack(COUNT_MSG, COUNT, seq, max(-128, min(127, delta.get("count", 0))))
+    t, r, c, owner = edge
+    claimed = delta["b"]
+    s1, s2 = delta["s"]
+    flags = (1 if t == "v" else 0) | owner << 1 | delta["p"] << 3 | delta["w"] << 5
+    out = bytearray(DELTA_HEAD_SIZE + 2 * len(claimed))
+    struct.pack_into(DELTA_HEAD, out, 0, DELTA, seq, flags, r, c, s1, s2, len(claimed))
+    pos = DELTA_HEAD_SIZE
+    for br, bc in claimed:
+        out[pos] = br
+        out[pos + 1] = bc
+        pos += 2
+    return bytes(out)
+
+
+def decode_server(buf):
+    """Inverse of encode_state/encode_delta, producing the JSON message dicts."""
+    kind = buf[0]
+    if kind == STATE:
+        _, seq, size, turn, winner, s1, s2, count = struct.unpack_from(STATE_HEAD, buf, 0)
+        h, pos = _unpack2(buf, STATE_HEAD_SIZE, size * (size - 1))
+        v, pos = _unpack2(buf, pos, (size - 1) * size)
+        b, pos = _unpack2(buf, pos, (size - 1) * (size - 1))
+        board = [[[0, 0] for _ in range(size)] for _ in range(size)]
+        for r in range(size):
+            for c in range(size - 1):
+                board[r][c][0] = h[r * (size - 1) + c]
+        for r in range(size - 1):
+            for c in range(size):
+                board[r][c][1] = v[r * size + c]
+        boxes = [b[r * (size - 1):(r + 1) * (size - 1)] for r in range(size - 1)]
+        msg = {"type": "state", "seq": seq, "board": board, "boxes": boxes,
+               "scores": {1: s1, 2: s2}, "currentPlayer": turn & 3, "winner": winner,
+               "count": count}
+        if turn >> 2 & 3:
+            level = turn >> 4 & 3
+            msg["ai"] = turn >> 2 & 3
+            msg["aiLevel"] = AI_LEVELS[level - 1] if level else None
+        return msg
+    if kind == DELTA:
+        _, seq, flags, r, c, s1, s2, n = struct.unpack_from(DELTA_HEAD, buf, 0)
+        pos = DELTA_HEAD_SIZE
+        claimed = [[buf[pos + 2 * i], buf[pos + 2 * i + 1]] for i in range(n)]
+        return {"type": "delta", "seq": seq,
+                "e": ["v" if flags & 1 else "h", r, c, (flags >> 1) & 3],
+                "b": claimed, "s": [s1, s2], "p": (flags >> 3) & 3, "w": (flags >> 5) & 3}
+    if kind == COUNT:
+        _, seq, count = struct.unpack(COUNT_MSG, buf)
+        return {"type": "delta", "seq": seq, "count": count}
+    if kind == PONG:
+        return {"type": "pong"}
+    raise ValueError("unknown server frame")
+
+
+# ---------- client -> server ----------
+def encode_client(msg):
+    mtype = msg.get("type")
+    if mtype == "reset":
+        return bytes((RESET,))
+    if mtype == "sync":
+        return bytes((SYNC,))
+    if mtype == "ping":
+        return bytes((PING,))
+    if mtype == "join":
+        return bytes((JOIN, msg.get("player") or 0))
+    t = msg.get("t", msg.get("orientation"))
+    r = msg.get("r", msg.get("row"))
+    c = msg.get("c", msg.get("col"))
+    flags = (1 if t == "v" else 0) | (msg.get("player") or 0) << 1
+    return bytes((MOVE, flags, r, c))
+
+
+def decode_client(buf):
+    """Binary client frame -> message dict, or None if malformed."""
+    if not buf:
+        return None
+    kind = buf[0]
+    if kind == MOVE and len(buf) == 4:
+        msg = {"type": "move", "t": "v" if buf[1] & 1 else "h", "r": buf[2], "c": buf[3]}
+        player = (buf[1] >> 1) & 3
+        if player:
+            msg["player"] = player
+        return msg
+    if kind == RESET:
+        return {"type": "reset"}
+    if kind == SYNC:
+        return {"type": "sync"}
+    if kind == JOIN and len(buf) == 2:
+        return {"type": "join", "player": buf[1]}
+    if kind == PING:
+        return {"type": "ping"}
+    return None
@@ -0,0 +1,84 @@
+# _wordle.py
+# Server-side Wordle (POST /api/wordle/new, POST /api/wordle/guess).
+# The solution is picked and kept here, so it only reaches the phone once the
+# game is over; guesses are checked against the packed word list
+# (utils/words.py) and scored with the same rules as the old client-side
+# formatGuess: greens first, then yellows from the letters left over.
+
+import os
+from binascii import hexlify
+
+GREEN = "green"
+YELLOW = "yellow"
+GREY = "grey"
+
+def score_guess(guess, solution):
+    """Per-letter marks for guess against solution."""
+    remaining = list(solution)
+    marks = [GREY] * len(guess)
+    for i, ch in enumerate(guess):
+        if i < len(remaining) and remaining[i] == ch:
+            remaining[i] = None
+            marks[i] = GREEN
+    for i, ch in enumerate(guess):
+        if marks[i] != GREEN and ch in remaining:
+            remaining[remaining.index(ch)] = None
+            marks[i] = YELLOW
+    return marks
+
+
+class Wordle:
+    sessions = {}         # id -> [solution, turn, guesses, last_used]
+    words = None          # utils.words.Word_List
+    max_sessions = 16     # oldest session is dropped beyond this
+    max_turns = 6
+
+    @classmethod
+    def configure(cls, config, words):
+        cfg = (config or {}).get("WORDLE", {})
+        cls.words = words
+        cls.max_sessions = cfg.get("MAX_SESSIONS", cls.max_sessions)
+        cls.max_turns = cfg.get("MAX_TURNS", cls.max_turns)
+
+    @classmethod
+    def _random_index(cls):
+        return int.from_bytes(os.urandom(4), "big") % cls.words.count
+
+    @classmethod
+    def new_game(cls, now):
+        """Starts a session; returns the response dict."""
+        if cls.words is None or not cls.words.count:
+            return {"ok": False, "error": "no word list"}
+        if len(cls.sessions) >= cls.max_sessions:
+            oldest = min(cls.sessions, key=lambda sid: cls.sessions[sid][3])
+            del cls.sessions[oldest]
+        sid = hexlify(os.urandom(6)).decode()
+        cls.sessions[sid] = [cls.words.word_at(cls._random_index()), 0, [], now]
+        return {"ok": True, "id": sid, "length": len(cls.sessions[sid][0]), "turns": cls.max_turns}
+
+    @classmethod
+    def guess(cls, sid, word, now):
+        """Checks and scores one guess; returns the response dict."""
+        session = cls.sessions.get(sid) if isinstance(sid, str) else None
+        if session is None:
+            return {"ok": False, "error": "unknown game"}
+        solution, turn, guesses, _ = session
+        session[3] = now
+        if not isinstance(word, str):
+            return {"ok": False, "error": "bad guess"}
+        word = word.lower()
+        if len(word) != len(solution):
+            return {"ok": True, "valid": False, "error": "Word Incomplete!!"}
+        if word in guesses:
+            return {"ok": True, "valid": False, "error": "You've already tried that word!!"}
+        if word not in cls.words:
+            return {"ok": True, "valid": False, "error": "No such words in library!!."}
+        guesses.append(word)
+        turn = session[1] = turn + 1
+        correct = word == solution
+        out = {"ok": True, "valid": True, "marks": score_guess(word, solution),
+               "correct": correct, "turn": turn}
+        if correct or turn >= cls.max_turns:
+            out["solution"] = solution
+            del cls.sessions[sid]  # game over; the id is no longer valid
+        return out
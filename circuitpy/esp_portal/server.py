@@ -1,88 +1,199 @@
 # --- server.py (patched) ---
 
 import time, json, wifi, socketpool
-from adafruit_httpserver import Server, Request, JSONResponse, Websocket, FileResponse, GET
+from adafruit_httpserver import Server, Request, Response, JSONResponse, Websocket, GET, POST, NO_REQUEST
+from utils import static
+from utils.words import Word_List, Definitions
+from utils.assets import AssetIndex
+from utils.cache import AssetCache
 from ._battleship import Battleship
 from ._dots_and_boxes import DotsAndBoxes
 from ._tic_tac_toe import TicTacToe
 from ._rock_paper_scissors import RockPaperScissors
+from ._hub import Hub
+from ._wordle import Wordle
+from ._outbox import Outbox
+from . import _wire
+from ._scheduler import Scheduler
+from ._metrics import METRICS
+from ._heartbeat import REAPER
+
+try:
+    from gc import mem_free  # CircuitPython only
+except ImportError:
+    mem_free = None
+
+
+class TrackedWebsocket(Websocket):
+    """Websocket that stamps last_seen on every frame read, pongs included."""
+    last_seen = 0
+
+    def _handle_frame(self, fin, opcode, payload):
+        self.last_seen = time.monotonic()
+        return super()._handle_frame(fin, opcode, payload)
 
 class ESPServer:
     def __init__(self, config=None, leaderboard=None):
         self.config = config
         self.leaderboard = leaderboard
+        self.cache = AssetCache.from_config(config)  # None unless CACHE.ENABLE
+        METRICS.configure(config)
+        Outbox.configure(config)  # per-socket send queue limits
+        REAPER.configure(config)  # heartbeat / idle-socket reaping
+        for game in (Battleship, DotsAndBoxes, RockPaperScissors, TicTacToe):
+            game.configure(config)  # ROOMS limits, per-game settings
+        wcfg = (config or {}).get("WORDLE", {})
+        words = Word_List(wcfg.get("WORDS_FILE", "/words.bin"))
+        Wordle.configure(config, words)
+        self.definitions = Definitions(words, wcfg.get("DEFS_INDEX", "/defs.idx"),
+                                       wcfg.get("DEFS_FILE", "/defs.bin"))
+        self._api_json = None
+        self._api_version = None
         
         self.pool = socketpool.SocketPool(wifi.radio)
         self.server = Server(self.pool, root_path="/_www", debug=False)
         self.server.request_buffer_size = 2048
+        self.assets = AssetIndex(self.server.root_path)
 
         # ---------- Routing ----------
         # Health ping
         @self.server.route("/api", GET)
         def api_route(request: Request):
-            return JSONResponse(request, {"ok": True, "ip": str(wifi.radio.ipv4_address), "leaderboard": self.leaderboard.load()}), ""
+            return Response(request, self._api_body(), content_type="application/json")
+        # Loop timings (microseconds), per-game poll cost, broadcast costs, drops
+        @self.server.route("/api/metrics", GET)
+        def metrics_route(request: Request):
+            snapshot = METRICS.snapshot()
+            snapshot["clients"] = {g.__name__: g.client_count() for g in self.pollables}
+            snapshot["rooms"] = {g.__name__: len(g.rooms) for g in self.pollables}
+            if self.cache is not None:
+                snapshot["cache"] = self.cache.stats()
+            if mem_free is not None:
+                snapshot["mem_free"] = mem_free()
+            return JSONResponse(request, snapshot)
+        # Wordle: the server picks and keeps the solution and scores guesses
+        @self.server.route("/api/wordle/new", POST)
+        def wordle_new(request: Request):
+            return JSONResponse(request, Wordle.new_game(time.monotonic()))
+
+        @self.server.route("/api/wordle/guess", POST)
+        def wordle_guess(request: Request):
+            try:
+                body = request.json() or {}
+            except ValueError:
+                body = {}
+            if not isinstance(body, dict):
+                body = {}
+            return JSONResponse(request, Wordle.guess(body.get("id"), body.get("guess"), time.monotonic()))
+
+        # One definition per request, read straight from flash via defs.idx
+        @self.server.route("/api/wordle/define/<word>", GET)
+        def wordle_define(request: Request, word: str):
+            text = self.definitions.lookup(word)
+            if text is None:
+                return JSONResponse(request, {"ok": False, "word": word, "error": "no definition"})
+            return JSONResponse(request, {"ok": True, "word": word.lower(), "definition": text})
         # Vite default assets location handling
         @self.server.route("/assets/<path:path>", GET)
         def assets(request: Request, path: str):
-            return FileResponse(request, f"/assets/{path}")
+            return self.serve(request, f"/assets/{path}")
         
         @self.server.route("/", GET)
         def home(request: Request):
-            return FileResponse(request, "/index.html")
+            return self.serve(request, "/index.html")
         @self.server.route("/battleship", GET)
         def route_battleship(request: Request):
-            return FileResponse(request, "/index.html")
+            return self.serve(request, "/index.html")
         
         @self.server.route("/dots-and-boxes", GET)
         def route_dnb_page(request: Request):
-            return FileResponse(request, "/index.html")
+            return self.serve(request, "/index.html")
         
         @self.server.route("/tic-tac-toe", GET)
         def route_ttt(request: Request):
-            return FileResponse(request, "/index.html")
+            return self.serve(request, "/index.html")
         
         @self.server.route("/r-p-s", GET)
         def route_rps(request: Request):
-            return FileResponse(request, "/index.html")
+            return self.serve(request, "/index.html")
         
         @self.server.route("/reactle", GET)
         def route_reactle(request: Request):
-            return FileResponse(request, "/index.html")
+            return self.serve(request, "/index.html")
         
         # ---------- Sockets ----------
         @self.server.route("/ws/battleship", GET)
         def ws_bat(request: Request):
-            print("WS handshake from", request.client_address, "path=/ws/battleship")
-            ws = Websocket(request)
-            Battleship.handle_ws(ws)
-            print("WS upgraded OK for", request.client_address)
-            return ws
+            return self._upgrade(request, Battleship, "/ws/battleship")
         
         @self.server.route("/ws/dots-and-boxes", GET)
         def ws_dnb(request: Request):
-            print("WS handshake from", request.client_address, "path=/ws/dots-and-boxes")
-            ws = Websocket(request)
-            DotsAndBoxes.handle_ws(ws)
-            print("WS upgraded OK for", request.client_address)
-            return ws
+            return self._upgrade(request, DotsAndBoxes, "/ws/dots-and-boxes")
         
         @self.server.route("/ws/rock-paper-scissors", GET)
         def ws_rps(request: Request):
-            print("WS handshake from", request.client_address, "path=/ws/rock-paper-scissors")
-            ws = Websocket(request)
-            RockPaperScissors.handle_ws(ws)
-            print("WS upgraded OK for", request.client_address)
-            return ws
+            return self._upgrade(request, RockPaperScissors, "/ws/rock-paper-scissors")
         
         @self.server.route("/ws/tic-tac-toe", GET)
         def ws_ttt(request: Request):
-            print("WS handshake from", request.client_address, "path=/ws/tic-tac-toe")
-            ws = Websocket(request)
-            TicTacToe.handle_ws(ws)
-            print("WS upgraded OK for", request.client_address)
-            return ws
+            return self._upgrade(request, TicTacToe, "/ws/tic-tac-toe")
+
+        # Optional hub: every game over one socket, "<channel>:<payload>" frames
+        self.hub_enabled = (config or {}).get("HUB", {}).get("ENABLE", False)
+        if self.hub_enabled:
+            Hub.configure(config, {
+                "battleship": Battleship,
+                "dots-and-boxes": DotsAndBoxes,
+                "rock-paper-scissors": RockPaperScissors,
+                "tic-tac-toe": TicTacToe,
+            })
+            @self.server.route("/ws", GET)
+            def ws_hub(request: Request):
+                return self._upgrade(request, Hub, "/ws")
         # ---------- Pollables Games ----------
         self.pollables = [Battleship, DotsAndBoxes, RockPaperScissors, TicTacToe]
+        if self.hub_enabled:
+            self.pollables.insert(0, Hub)  # fills channel inboxes before the games read them
+        # Score writes are coalesced in RAM and flushed from the loop
+        background = [leaderboard.maybe_flush] if leaderboard else []
+        background.append(REAPER.poll)
+        self.scheduler = Scheduler(self._poll_http, self.pollables, self.config, background)
+        # SCHEDULER MODE "ASYNC" swaps the tick loop for asyncio tasks
+        self.mode = (config or {}).get("SCHEDULER", {}).get("MODE", "TICK")
+
+    def _api_body(self):
+        # Health ping body, rebuilt only when the leaderboard version moves;
+        # no flash read and no json.dumps on the hot path.
+        version = self.leaderboard.version if self.leaderboard else None
+        if self._api_json is None or version != self._api_version:
+            board = self.leaderboard.to_json() if self.leaderboard else "null"
+            ip = json.dumps(str(wifi.radio.ipv4_address))
+            self._api_json = '{"ok": true, "ip": ' + ip + ', "leaderboard": ' + board + '}'
+            self._api_version = version
+        return self._api_json
+
+    def _upgrade(self, request, game, path):
+        # /ws/<game>?room=<name> joins (or opens) that room; no room = shared default
+        # &proto=delta asks for per-move deltas instead of full state broadcasts,
+        # &proto=bin (or the game.bin.v1 subprotocol) for the _wire binary layout
+        room = request.query_params.get("room")
+        proto = request.query_params.get("proto")
+        headers = None
+        if _wire.SUBPROTOCOL in (request.headers.get("Sec-WebSocket-Protocol") or ""):
+            proto = "bin"
+            headers = {"Sec-WebSocket-Protocol": _wire.SUBPROTOCOL}
+        print("WS handshake from", request.client_address, "path=" + path, "room=" + str(room))
+        ws = TrackedWebsocket(request, headers=headers)
+        game.handle_ws(ws, room, proto)
+        print("WS upgraded OK for", request.client_address)
+        return ws
+
+    def serve(self, request, path):
+        # .gz sibling when accepted, strong ETag, 304 on If-None-Match, RAM cache if enabled
+        return static.file_response(request, self.assets, path, self.cache)
+
+    def _poll_http(self):
+        return self.server.poll() != NO_REQUEST
 
     def start(self):
         print("Starting ESP WebSocket server…")
@@ -90,8 +201,21 @@ class ESPServer:
         self.server.start(ip, 80)
         print(f"HTTP/WS listening at: http://{ip}")
 
+        if self.mode == "ASYNC":
+            try:
+                from ._async_core import AsyncCore
+            except ImportError as e:
+                print("asyncio unavailable, using the tick loop:", e)
+            else:
+                # Periodic jobs get timers instead of running every tick
+                timers = [(REAPER.slot_s, REAPER.poll)]
+                if self.leaderboard:
+                    timers.append((1, self.leaderboard.maybe_flush))
+                feeders = (Hub,) if self.hub_enabled else ()
+                AsyncCore(self._poll_http, self.pollables, self.config, timers, feeders).serve_forever()
+                return
+
         while True:
-            self.server.poll()           # service HTTP + WS handshakes
-            for g in self.pollables:     # poll ALL games each tick
-                g.poll()
-            time.sleep(0.01)
+            delay = self.scheduler.tick()    # HTTP + WS handshakes, then live games only
+            if delay:
+                time.sleep(delay)
@@ -8,7 +8,8 @@ from utils.leader import Leader_Board
 
 # VARIABLES
 CONFIG_FILE = "/config.json"
-LEADERBOARD_FILE = "/leaderboard.json"
+LEADERBOARD_FILE = "/leaderboard.bin"
+LEGACY_LEADERBOARD_FILE = "/leaderboard.json"  # imported once if no .bin exists
 
 
 # FUNCTIONS
@@ -23,7 +24,7 @@ def load_config(file):
 # MAIN
 def main():
     config = load_config(CONFIG_FILE)
-    leaderboard = Leader_Board(LEADERBOARD_FILE)
+    leaderboard = Leader_Board(LEADERBOARD_FILE, config, LEGACY_LEADERBOARD_FILE)
     espWifi = ESP_Wifi(config)
     # Connect to WiFi or start an access point
     if config["MODE"] == "WIFI":
@@ -0,0 +1,102 @@
+# assets.py
+# Boot-time index of the built web root (_www).
+# One walk of the tree (plus the Vite manifest) at startup records size, MIME
+# type, ETag and gzip variant for every servable file, so requests are served
+# with a dict lookup and no filesystem stat; anything not indexed is a 404.
+
+import json, os
+from adafruit_httpserver import MIMETypes
+
+MANIFESTS = ("/.vite/manifest.json", "/manifest.json")  # Vite 5+ / Vite 2-4
+
+# Vite names bundle files <name>.<hash>.<ext> (v2) or <name>-<hash>.<ext> (v3+)
+HASH_LENGTH = 8
+
+
+def name_hash(path):
+    """Returns the content hash embedded in a Vite file name, or None."""
+    name = path.rsplit("/", 1)[-1]
+    stem = name.rsplit(".", 1)[0]
+    cut = max(stem.rfind("."), stem.rfind("-"))
+    if cut < 0:
+        return None
+    digest = stem[cut + 1:]
+    if len(digest) == HASH_LENGTH and digest.isalnum():
+        return digest
+    return None
+
+
+def _is_dir(st):
+    return st[0] & 0x4000 != 0
+
+
+class AssetIndex:
+    def __init__(self, root):
+        self.root = root
+        self.entries = {}   # "/assets/x.js" -> (size, gz_size|-1, mime, hash, immutable)
+        self.gzipped = 0
+        try:
+            self._scan("")
+        except OSError as e:
+            print(f"Asset index: cannot read {root}: {e}")
+        self._apply_manifest()
+        print(f"Asset index: {len(self.entries)} files, {self.gzipped} gzipped")
+
+    def _scan(self, folder):
+        names = os.listdir(self.root + folder)
+        present = set(names)
+        for name in names:
+            if name.startswith("."):
+                continue  # .vite/ (manifest) and editor droppings are never served
+            path = f"{folder}/{name}"
+            if path in MANIFESTS:
+                continue  # build metadata, read by _apply_manifest()
+            st = os.stat(self.root + path)
+            if _is_dir(st):
+                self._scan(path)
+                continue
+            if name.endswith(".gz") and name[:-3] in present:
+                continue  # recorded on the original's entry
+            gz_size = -1
+            if name + ".gz" in present:
+                gz_size = os.stat(self.root + path + ".gz")[6]
+                self.gzipped += 1
+            digest = name_hash(name)
+            immutable = digest is not None
+            if digest is None:
+                # st[6] / st[8] = size / mtime on CircuitPython tuples and CPython stat_result
+                digest = f"{st[6]:x}-{int(st[8]):x}"
+            self.entries[path] = (st[6], gz_size, MIMETypes.get_for_filename(name), digest, immutable)
+
+    def _apply_manifest(self):
+        manifest = None
+        for name in MANIFESTS:
+            try:
+                with open(self.root + name, "r") as f:
+                    manifest = json.load(f)
+                break
+            except (OSError, ValueError):
+                continue
+        if manifest is None:
+            return
+        # Everything the manifest lists is content-addressed, even when the
+        # name_hash() heuristic could not parse its hash out of the file name.
+        for chunk in manifest.values():
+            files = [chunk.get("file")] + chunk.get("css", []) + chunk.get("assets", [])
+            for file in files:
+                entry = self.entries.get(f"/{file}") if file else None
+                if entry is not None:
+                    self.entries[f"/{file}"] = entry[:4] + (True,)
+
+    def lookup(self, path, gzip=False):
+        """
+        Pick the representation of `path` (relative to root) to send.
+        Returns (send_path, size, content_type, etag, immutable, gzip) or None.
+        """
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        size, gz_size, content_type, digest, immutable = entry
+        if gzip and gz_size >= 0:
+            return self.root + path + ".gz", gz_size, content_type, f'"{digest}-gz"', immutable, True
+        return self.root + path, size, content_type, f'"{digest}"', immutable, False
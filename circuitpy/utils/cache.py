@@ -0,0 +1,82 @@
+# cache.py
+# Byte-budgeted LRU cache for small, hot static files (index.html, main chunks).
+# Bodies are kept exactly as sent (gzip variants are separate entries), and
+# nothing is cached when it would eat into the heap kept free for websockets.
+
+from collections import OrderedDict
+
+try:
+    from gc import mem_free  # CircuitPython only
+except ImportError:
+    mem_free = None
+
+
+class AssetCache:
+    def __init__(self, budget, max_entry=None, heap_reserve=0):
+        self.budget = budget
+        self.max_entry = max_entry or budget // 4
+        self.heap_reserve = heap_reserve
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # insertion order == recency order; get() re-inserts on every hit
+        self._entries = OrderedDict()
+
+    @classmethod
+    def from_config(cls, config):
+        """Returns an AssetCache for config["CACHE"], or None when disabled."""
+        cfg = (config or {}).get("CACHE", {})
+        if not cfg.get("ENABLE", False):
+            return None
+        return cls(cfg.get("BUDGET", 32768), cfg.get("MAX_ENTRY"), cfg.get("HEAP_RESERVE", 0))
+
+    def get(self, key):
+        body = self._entries.pop(key, None)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries[key] = body
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        """
+        Store body under key, evicting least recently used entries to fit.
+        Returns False if the body is too big or the heap is too low to keep it.
+        """
+        size = len(body)
+        if size > self.max_entry or size > self.budget:
+            return False
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.used -= len(old)
+        while self._entries and self.used + size > self.budget:
+            self._evict()
+        if mem_free is not None:
+            while self._entries and mem_free() < self.heap_reserve:
+                self._evict()
+            if mem_free() < self.heap_reserve:
+                return False
+        self._entries[key] = body
+        self.used += size
+        return True
+
+    def _evict(self):
+        key = next(iter(self._entries))
+        self.used -= len(self._entries.pop(key))
+        self.evictions += 1
+
+    def clear(self):
+        self._entries = OrderedDict()
+        self.used = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.used,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -1,39 +1,328 @@
-import json
+import json, os, struct, time
+
+try:
+    from bisect import bisect_right
+except ImportError:  # not built into every CircuitPython port
+    def bisect_right(a, x):
+        lo, hi = 0, len(a)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if x < a[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+# Compact store: header, then per game a name, the top-N table and the
+# per-player bests as fixed 10-byte records (6 bytes of initials, int32 score).
+MAGIC = b"LBD1"
+HEADER = "<4sB"      # magic, game count
+GAME = "<B"          # name length, followed by the name
+COUNTS = "<HH"       # leaders, bests
+RECORD = "<6si"      # initials (NUL padded), score
+RECORD_SIZE = struct.calcsize(RECORD)
+INITIALS_LEN = 6
+NAME_MAX = 255       # game names are stored behind a one-byte length
+SCORE_MIN = -0x7FFFFFFF - 1
+SCORE_MAX = 0x7FFFFFFF
 
 class Leader_Board:
-    def __init__(self, filename):
+    def __init__(self, filename, config=None, legacy_file=None):
+        """
+        filename:    compact store on the drive, e.g. "/leaderboard.bin".
+        config:      app config; the optional LEADERBOARD section sets
+                     DEPTH (top-N per game), MAX_PLAYERS (per-player bests
+                     kept per game), WRITE_BEHIND (default true) and
+                     FLUSH_INTERVAL seconds.
+        legacy_file: old JSON leaderboard ("INITALS"/"SCORE" rows), imported
+                     when no compact store exists yet.
+        """
+        cfg = (config or {}).get("LEADERBOARD", {})
         self.filename = filename
-        self.data = self.load()
+        self.tmp_file = filename + ".tmp"
+        self.bak_file = filename + ".bak"
+        self.legacy_file = legacy_file
+        self.depth = cfg.get("DEPTH", 3)
+        self.max_players = cfg.get("MAX_PLAYERS", 64)
+        self.write_behind = cfg.get("WRITE_BEHIND", True)
+        self.flush_interval = cfg.get("FLUSH_INTERVAL", 5)
+        # Per game: rows sorted best-first as (-score, seq, initials) so a
+        # plain bisect finds the slot; seq keeps earlier entries above ties.
+        self.boards = {}
+        self.bests = {}
+        self._seq = 0
+        # Bumped on every accepted score; readers key their caches on it
+        self.version = 0
+        self._json = None
+        self._json_version = -1
+        self.dirty = False
+        self._dirty_since = 0
+        self.load()
 
+    # ---------- loading ----------
     def load(self):
-        try:
-            with open(self.filename, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading leaderboard: {e}")
-            return {}
+        # A power cut can land anywhere in save(); whichever copy still
+        # parses is the last good one. The .tmp file only outlives a save
+        # when the crash came after it was fully written.
+        for name in (self.filename, self.tmp_file, self.bak_file):
+            try:
+                with open(name, "rb") as f:
+                    self._unpack(f.read())
+            except Exception as e:
+                print(f"Error loading leaderboard {name}: {e}")
+                continue
+            self._trim()
+            if name != self.filename:
+                print(f"Recovered leaderboard from {name}")
+                # Rewrite the main file; it is still missing or corrupt
+                self.mark_dirty()
+                if not self.write_behind:
+                    self.flush()
+            return
+        if self.legacy_file:
+            try:
+                with open(self.legacy_file, "r") as f:
+                    self._import_json(json.load(f))
+            except Exception as e:
+                print(f"Error loading leaderboard {self.legacy_file}: {e}")
+                return
+            self._trim()
+            print(f"Imported leaderboard from {self.legacy_file}")
+            self.mark_dirty()  # converted to the compact store on next flush
+
+    def _trim(self):
+        # A store written under a larger DEPTH still holds the extra rows
+        for board in self.boards.values():
+            del board[self.depth:]
+
+    def _import_json(self, data):
+        for game_key, game in data.items():
+            if len(game_key.encode()) > NAME_MAX:
+                print(f"Skipping leaderboard game with a long name: {game_key[:16]}...")
+                continue
+            rows = []
+            for rank, entry in game.get("LEADERS", {}).items():
+                rows.append((int(rank), _initials(entry["INITALS"]), _score(entry["SCORE"])))
+            rows.sort()
+            board = self._board(game_key)
+            for _, initials, score in rows:
+                self._insert(board, initials, score)
+            bests = self.bests[game_key]
+            for initials, score in game.get("PLAYED", {}).items():
+                # initials that only differed past the cut share one entry
+                initials, score = _initials(initials), _score(score)
+                if initials not in bests or score > bests[initials]:
+                    bests[initials] = score
+
+    def _unpack(self, buf):
+        magic, games = struct.unpack_from(HEADER, buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a leaderboard store")
+        pos = struct.calcsize(HEADER)
+        boards, bests = {}, {}
+        for _ in range(games):
+            n = buf[pos]
+            game_key = _text(buf[pos + 1:pos + 1 + n])
+            pos += 1 + n
+            leaders, players = struct.unpack_from(COUNTS, buf, pos)
+            pos += struct.calcsize(COUNTS)
+            board = boards[game_key] = []
+            for _ in range(leaders):
+                initials, score = struct.unpack_from(RECORD, buf, pos)
+                pos += RECORD_SIZE
+                board.append((-score, self._seq, _decode(initials)))
+                self._seq += 1
+            table = bests[game_key] = {}
+            for _ in range(players):
+                initials, score = struct.unpack_from(RECORD, buf, pos)
+                pos += RECORD_SIZE
+                table[_decode(initials)] = score
+        if pos != len(buf):
+            raise ValueError("truncated leaderboard store")
+        self.boards, self.bests = boards, bests
+
+    def _pack(self):
+        size = struct.calcsize(HEADER)
+        names = {}
+        for game_key, board in self.boards.items():
+            name = names[game_key] = game_key.encode()
+            if len(name) > NAME_MAX:
+                raise ValueError(f"game name over {NAME_MAX} bytes")
+            size += 1 + len(name) + struct.calcsize(COUNTS)
+            size += (len(board) + len(self.bests[game_key])) * RECORD_SIZE
+        buf = bytearray(size)
+        struct.pack_into(HEADER, buf, 0, MAGIC, len(self.boards))
+        pos = struct.calcsize(HEADER)
+        for game_key, board in self.boards.items():
+            name = names[game_key]
+            buf[pos] = len(name)
+            buf[pos + 1:pos + 1 + len(name)] = name
+            pos += 1 + len(name)
+            bests = self.bests[game_key]
+            struct.pack_into(COUNTS, buf, pos, len(board), len(bests))
+            pos += struct.calcsize(COUNTS)
+            for neg_score, _, initials in board:
+                struct.pack_into(RECORD, buf, pos, _encode(initials), -neg_score)
+                pos += RECORD_SIZE
+            for initials, score in bests.items():
+                struct.pack_into(RECORD, buf, pos, _encode(initials), score)
+                pos += RECORD_SIZE
+        return buf
+
+    # ---------- rendering ----------
+    @property
+    def data(self):
+        """The original JSON shape: LEADERS by rank, PLAYED as per-player bests."""
+        out = {}
+        for game_key, board in self.boards.items():
+            leaders = {}
+            for i, (neg_score, _, initials) in enumerate(board, 1):
+                leaders[str(i)] = {"INITALS": initials, "SCORE": -neg_score}
+            out[game_key] = {"PLAYED": dict(self.bests[game_key]), "LEADERS": leaders}
+        return out
+
+    def to_json(self):
+        """Serialized leaderboard, rebuilt only when the data has changed."""
+        if self._json_version != self.version:
+            self._json = json.dumps(self.data)
+            self._json_version = self.version
+        return self._json
 
+    # ---------- persistence ----------
     def save(self):
-        with open(self.filename, "w") as f:
-            json.dump(self.data, f)
+        # FAT can't rename over an existing file, so the old copy is parked
+        # as .bak first; at every step at least one complete file exists.
+        with open(self.tmp_file, "wb") as f:
+            f.write(self._pack())
+        try:
+            os.remove(self.bak_file)
+        except OSError:
+            pass
+        try:
+            os.rename(self.filename, self.bak_file)
+        except OSError:
+            pass  # first save, nothing to keep
+        os.rename(self.tmp_file, self.filename)
+        self.dirty = False
 
-    def try_add_score(self, game_key, initials, score):
-        leaders = self.data[game_key]["LEADERS"]
-        # Convert to a list of (rank, initials, score)
-        scores = [
-            (int(rank), entry["INITALS"], entry["SCORE"])
-            for rank, entry in leaders.items()
-        ]
-        # Sort by score descending, then by rank
-        scores.sort(key=lambda x: (-x[2], x[0]))
-        # If the new score is higher than the lowest, insert it
-        if score > scores[-1][2]:
-            scores.append((0, initials, score))
-            # Sort again and keep top 3
-            scores = sorted(scores, key=lambda x: -x[2])[:3]
-            # Rebuild the LEADERS dict
-            for i, (rank, inits, sc) in enumerate(scores, 1):
-                leaders[str(i)] = {"INITALS": inits, "SCORE": sc}
+    def mark_dirty(self):
+        if not self.dirty:
+            self.dirty = True
+            self._dirty_since = time.monotonic()
+
+    def maybe_flush(self, now=None):
+        """
+        Called from the server loop. Writes the board once FLUSH_INTERVAL
+        seconds have passed since the first unsaved change; returns True
+        when a write happened.
+        """
+        if not self.dirty:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if now - self._dirty_since < self.flush_interval:
+            return False
+        return self.flush()
+
+    def flush(self):
+        if not self.dirty:
+            return False
+        try:
             self.save()
-            return True  # Score was added
-        return False  # Score was not high enough
\ No newline at end of file
+        except (OSError, ValueError, struct.error) as e:
+            # Drive mounted read-only (USB attached) or full, or a record that
+            # won't pack; retry next interval rather than take the loop down
+            print(f"Error saving leaderboard: {e}")
+            self._dirty_since = time.monotonic()
+            return False
+        return True
+
+    # ---------- scores ----------
+    def _board(self, game_key):
+        board = self.boards.get(game_key)
+        if board is None:
+            board = self.boards[game_key] = []
+            self.bests[game_key] = {}
+        return board
+
+    def _insert(self, board, initials, score):
+        """Places a row in the sorted table; returns its 1-based rank or 0."""
+        row = (-score, self._seq, initials)
+        i = bisect_right(board, row)
+        if i >= self.depth:
+            return 0
+        self._seq += 1
+        board.insert(i, row)
+        if len(board) > self.depth:
+            board.pop()
+        return i + 1
+
+    def rank_of(self, game_key, score):
+        """Rank a score would get right now, 0 when it misses the table."""
+        board = self.boards.get(game_key, ())
+        i = bisect_right(board, (-score, self._seq, ""))
+        return i + 1 if i < self.depth else 0
+
+    def best_of(self, game_key, initials):
+        return self.bests.get(game_key, {}).get(initials)
+
+    def try_add_score(self, game_key, initials, score):
+        if len(game_key.encode()) > NAME_MAX:
+            return False
+        try:
+            # clamped up front: a score that won't pack as int32 would
+            # otherwise sit in the table and fail every save after it
+            score = _score(score)
+        except (TypeError, ValueError, OverflowError):
+            return False
+        initials = _initials(initials)
+        board = self._board(game_key)
+        changed = False
+        bests = self.bests[game_key]
+        best = bests.get(initials)
+        if best is None and len(bests) >= self.max_players:
+            pass  # table full: only players already tracked are updated
+        elif best is None or score > best:
+            bests[initials] = score
+            changed = True
+        # O(log N) search for the slot; ties keep the earlier entry on top
+        added = self._insert(board, initials, score) > 0
+        if added or changed:
+            self.version += 1
+            if self.write_behind:
+                self.mark_dirty()  # flushed from the server loop
+            else:
+                self.save()
+        return added
+
+
+def _score(value):
+    """Score as an int that fits the record's int32."""
+    return max(SCORE_MIN, min(SCORE_MAX, int(value)))
+
+
+def _text(raw):
+    """Decodes UTF-8, dropping a character cut off at the end (or bad bytes)."""
+    raw = bytes(raw)
+    for cut in range(4):
+        try:
+            return raw[:len(raw) - cut].decode()
+        except UnicodeError:
+            pass
+    return ""
+
+
+def _initials(value):
+    """
+    Initials as stored: at most INITIALS_LEN bytes of UTF-8, cut on a
+    character boundary, so what goes in is exactly what comes back.
+    """
+    return _text(str(value).replace("\0", "").encode()[:INITIALS_LEN])
+
+
+def _encode(initials):
+    return initials.encode()[:INITIALS_LEN]
+
+
+def _decode(raw):
+    return _text(bytes(raw).rstrip(b"\0"))
@@ -0,0 +1,106 @@
+# static.py
+# Shared static-file handling for ESPServer and PortalServer:
+# pre-compressed .gz siblings, strong ETags and If-None-Match -> 304.
+# File metadata comes from the boot-time AssetIndex (utils/assets.py).
+
+from adafruit_httpserver import Response, Status, NOT_FOUND_404
+
+NOT_MODIFIED_304 = Status(304, "Not Modified")
+
+# Hashed bundle files never change under the same URL; index.html must revalidate.
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+# One chunk buffer shared by every StreamResponse; the server handles a single
+# request at a time, so peak memory stays at STREAM_CHUNK whatever the file size.
+STREAM_CHUNK = 2048
+_stream_buffer = None
+
+
+class StreamResponse(Response):
+    """
+    Sends a file from flash in fixed-size chunks with a correct Content-Length.
+    Binary-safe: the file is never decoded or read whole into RAM.
+    """
+
+    def __init__(self, request, path, size, *, content_type=None, headers=None):
+        super().__init__(request, content_type=content_type, headers=headers)
+        self._path = path
+        self._length = size
+
+    def _send(self):
+        global _stream_buffer
+        if _stream_buffer is None:
+            _stream_buffer = bytearray(STREAM_CHUNK)
+        view = memoryview(_stream_buffer)
+        self._send_headers(self._length, self._content_type)
+        if self._request.method != "HEAD":
+            connection = self._request.connection
+            with open(self._path, "rb") as file:
+                while True:
+                    count = file.readinto(_stream_buffer)
+                    if not count:
+                        break
+                    self._send_bytes(connection, view[:count])
+        self._close_connection()
+
+
+def accepts_gzip(request):
+    return "gzip" in (request.headers.get("Accept-Encoding") or "")
+
+
+def lookup(request, index, path):
+    """
+    Pick the representation of `path` to send using the asset index.
+    Returns (send_path, size, content_type, headers) or None if not indexed.
+    """
+    found = index.lookup(path, accepts_gzip(request))
+    if found is None:
+        return None
+    send_path, size, content_type, etag, immutable, gzip = found
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_IMMUTABLE if immutable else CACHE_REVALIDATE,
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return send_path, size, content_type, headers
+
+
+def is_fresh(request, headers):
+    match = request.headers.get("If-None-Match")
+    if not match:
+        return False
+    match = match.strip()
+    return match == "*" or headers["ETag"] in match
+
+
+def not_modified(request, headers):
+    return Response(request, "", status=NOT_MODIFIED_304, headers=headers)
+
+
+def not_found(request):
+    return Response(request, "File not found", status=NOT_FOUND_404)
+
+
+def file_response(request, index, path, cache=None):
+    """
+    Response for `path` (relative to the index root) with gzip negotiation and
+    conditional GET. Small files go through `cache` (an AssetCache) when one is
+    given; the rest are streamed from flash.
+    """
+    found = lookup(request, index, path)
+    if found is None:
+        return not_found(request)
+    send_path, size, content_type, headers = found
+    if is_fresh(request, headers):
+        return not_modified(request, headers)
+    if cache is not None and size <= cache.max_entry:
+        body = cache.get(send_path)
+        if body is None:
+            with open(send_path, "rb") as file:
+                body = file.read()
+            cache.put(send_path, body)
+        return Response(request, body, content_type=content_type, headers=headers)
+    return StreamResponse(request, send_path, size, content_type=content_type, headers=headers)
@@ -0,0 +1,125 @@
+# words.py
+# Sorted word list packed WORD_LEN bytes per word (lowercase ASCII, no
+# separators), as written by tools/pack_words.py. Lookups binary-search the
+# file with seek() + a WORD_LEN-byte read, so the list never sits in RAM:
+# ~12 reads for 2.5k words.
+#
+# Definitions sit beside it in the same order: defs.idx holds an offset per
+# word into defs.bin, so serving one definition is a word lookup, one 8-byte
+# index read and one read of exactly that entry.
+
+import os, struct
+
+try:
+    import zlib  # only needed for a definitions blob packed with --compress
+except ImportError:
+    zlib = None
+
+WORD_LEN = 5
+INDEX_MAGIC = b"WDX1"
+INDEX_HEADER = "<4sBxxxI"   # magic, flags, word count
+INDEX_HEADER_SIZE = struct.calcsize(INDEX_HEADER)
+FLAG_ZLIB = 1
+
+class Word_List:
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        self._f = None
+        try:
+            self.count = os.stat(filename)[6] // WORD_LEN
+        except OSError as e:
+            print(f"Error loading word list {filename}: {e}")
+
+    def _file(self):
+        if self._f is None:
+            self._f = open(self.filename, "rb")
+        return self._f
+
+    def _read(self, i):
+        f = self._file()
+        f.seek(i * WORD_LEN)
+        return f.read(WORD_LEN)
+
+    def word_at(self, i):
+        return self._read(i).decode()
+
+    def index_of(self, word):
+        """Position of word in the list, or -1."""
+        if len(word) != WORD_LEN or not self.count:
+            return -1
+        try:
+            key = word.lower().encode()
+        except UnicodeError:
+            return -1
+        lo, hi = 0, self.count
+        try:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                probe = self._read(mid)
+                if probe == key:
+                    return mid
+                if probe < key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        except OSError as e:
+            print(f"Error reading word list: {e}")
+            self.close()  # reopened on the next lookup
+        return -1
+
+    def __contains__(self, word):
+        return self.index_of(word) >= 0
+
+    def close(self):
+        if self._f is not None:
+            try:
+                self._f.close()
+            except OSError:
+                pass
+            self._f = None
+
+
+class Definitions:
+    def __init__(self, words, index_file, blob_file):
+        """
+        words:      Word_List the index was packed against.
+        index_file: defs.idx (header, then count + 1 u32 offsets).
+        blob_file:  defs.bin (concatenated entries, zlib'd if flagged).
+        """
+        self.words = words
+        self.index_file = index_file
+        self.blob_file = blob_file
+        self.flags = 0
+        self.available = False
+        try:
+            with open(index_file, "rb") as f:
+                magic, self.flags, count = struct.unpack(INDEX_HEADER, f.read(INDEX_HEADER_SIZE))
+            if magic != INDEX_MAGIC or count != words.count:
+                raise ValueError("index does not match the word list")
+            if self.flags & FLAG_ZLIB and zlib is None:
+                raise ValueError("compressed definitions need zlib")
+            self.available = True
+        except (OSError, ValueError) as e:
+            print(f"Error loading definitions {index_file}: {e}")
+
+    def lookup(self, word):
+        """Definition text for word, or None."""
+        if not self.available:
+            return None
+        i = self.words.index_of(word)
+        if i < 0:
+            return None
+        try:
+            with open(self.index_file, "rb") as f:
+                f.seek(INDEX_HEADER_SIZE + 4 * i)
+                start, end = struct.unpack("<II", f.read(8))
+            with open(self.blob_file, "rb") as f:
+                f.seek(start)
+                data = f.read(end - start)
+        except OSError as e:
+            print(f"Error reading definition for {word}: {e}")
+            return None
+        if self.flags & FLAG_ZLIB:
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
@@ -23,6 +23,9 @@ const WS_URLS = {
   'rock-paper-scissors': `${wsProtocol}://${window.location.hostname}/ws/rock-paper-scissors`,
   'tic-tac-toe': `${wsProtocol}://${window.location.hostname}/ws/tic-tac-toe`,
 };
+// Hub: all games over one socket, frames are "<channel>:<payload>", channel 0 is control
+const HUB_URL = `${wsProtocol}://${window.location.hostname}/ws`;
+const GAMES = Object.keys(WS_URLS) as (keyof PlayerCounts)[];
 
 export const Dashboard = () => {
   const [counts, setCounts] = useState<PlayerCounts>(initialCounts);
@@ -33,36 +36,61 @@ export const Dashboard = () => {
   useEffect(() => {
     setLoading(true);
     setError(null);
-    const sockets: { [key: string]: WebSocket } = {};
-    let openCount = 0;
+    const sockets: WebSocket[] = [];
+    let closed = false;
 
-    (Object.keys(WS_URLS) as (keyof PlayerCounts)[]).forEach((game) => {
-      const ws = new WebSocket(WS_URLS[game]);
-      sockets[game] = ws;
-
-      ws.onopen = () => {
-        openCount++;
-        if (openCount === Object.keys(WS_URLS).length) setLoading(false);
-      };
+    const onCount = (game: keyof PlayerCounts, raw: string) => {
+      try {
+        // Expecting a message like: { count: 2 }
+        const data = JSON.parse(raw);
+        if (typeof data.count !== 'number') return;
+        setCounts((prev) => ({ ...prev, [game]: data.count }));
+        setLoading(false); // Set loading to false when a count is received
+      } catch (err) {
+        setError('Invalid data from ' + game);
+      }
+    };
 
-      ws.onmessage = (event) => {
-        try {
-          // Expecting a message like: { count: 2 }
-          const data = JSON.parse(event.data);
-          setCounts((prev) => ({ ...prev, [game]: data.count }));
-          setLoading(false); // Set loading to false when a count is received
-        } catch (err) {
-          setError('Invalid data from ' + game);
-        }
-      };
+    // One socket per game; used when the server has no /ws hub
+    const connectEach = () => {
+      let openCount = 0;
+      GAMES.forEach((game) => {
+        const ws = new WebSocket(WS_URLS[game]);
+        sockets.push(ws);
+        ws.onopen = () => {
+          openCount++;
+          if (openCount === GAMES.length) setLoading(false);
+        };
+        ws.onmessage = (event) => onCount(game, event.data);
+        ws.onerror = () => setError('WebSocket error for ' + game);
+      });
+    };
 
-      ws.onerror = (err) => {
-        setError('WebSocket error for ' + game);
-      };
-    });
+    const hub = new WebSocket(HUB_URL);
+    sockets.push(hub);
+    let hubOpened = false;
+    hub.onopen = () => {
+      hubOpened = true;
+      GAMES.forEach((game, i) => {
+        hub.send('0:' + JSON.stringify({ type: 'open', ch: i + 1, game }));
+      });
+    };
+    hub.onmessage = (event) => {
+      const msg = String(event.data);
+      const sep = msg.indexOf(':');
+      const ch = Number(msg.slice(0, sep));
+      if (sep > 0 && ch >= 1 && ch <= GAMES.length) onCount(GAMES[ch - 1], msg.slice(sep + 1));
+    };
+    hub.onclose = () => {
+      if (!hubOpened && !closed) connectEach();
+    };
+    hub.onerror = () => {
+      if (hubOpened) setError('WebSocket error for hub');
+    };
 
     return () => {
-      Object.values(sockets).forEach((ws) => ws.close());
+      closed = true;
+      sockets.forEach((ws) => ws.close());
     };
   }, []);
 
@@ -13,16 +13,31 @@ interface GameState {
   scores: { 1: number; 2: number };
   currentPlayer: Player;
   winner?: 0 | 1 | 2;
+  ai?: PlayerOrSpectator;        // seat the computer holds, 0 = none
+  aiLevel?: AiLevel | null;
+}
+type AiLevel = "easy" | "medium" | "hard";
+// Per-move update (?proto=delta): edge [t, r, c, owner], claimed boxes,
+// scores [p1, p2], player to move, winner; or just a new count after a join.
+interface DeltaMsg {
+  type: "delta";
+  seq: number;
+  e?: ["h" | "v", number, number, EdgeOwner];
+  b?: [number, number][];
+  s?: [number, number];
+  p?: Player;
+  w?: 0 | 1 | 2;
+  count?: number;
 }
 type ServerMsg =
-  | ({ type: "state" } & GameState & { count?: number })
+  | ({ type: "state"; seq?: number } & GameState & { count?: number })
+  | DeltaMsg
   | { type: "error"; reason: string }
   | { type: "ping" }
   | any;
 
 /** ---- Constants ---- */
-const BOARD_SIZE = 8;           // must match server
-const DOTS = BOARD_SIZE;
+const BOARD_SIZE = 8;           // placeholder until the first state; the server's DOTS_AND_BOXES.BOARD_SIZE wins
 const BOXES = BOARD_SIZE - 1;
 
 const wsProtocol = location.protocol === "https:" ? "wss" : "ws";
@@ -30,7 +45,7 @@ const WS_HOST =
   (import.meta as any).env?.VITE_WS_HOST && (import.meta as any).env.VITE_WS_HOST.trim()
     ? (import.meta as any).env.VITE_WS_HOST.trim()
     : location.host;
-const WS_URL = `${wsProtocol}://${WS_HOST}/ws/dots-and-boxes`;
+const WS_URL = `${wsProtocol}://${WS_HOST}/ws/dots-and-boxes?proto=delta`;
 
 /** ---- Helpers ---- */
 const emptyBoard = (): [EdgeOwner, EdgeOwner][][] =>
@@ -43,6 +58,30 @@ const emptyBoxes = (): BoxOwner[][] =>
     Array.from({ length: BOXES }, () => 0 as BoxOwner)
   );
 
+const applyDelta = (prev: GameState, d: DeltaMsg): GameState => {
+  if (!d.e) return prev;
+  const [t, r, c, owner] = d.e;
+  const board = prev.board.slice();
+  board[r] = board[r].slice();
+  board[r][c] = (t === "h" ? [owner, board[r][c][1]] : [board[r][c][0], owner]) as [EdgeOwner, EdgeOwner];
+  let boxes = prev.boxes;
+  if (d.b && d.b.length) {
+    boxes = prev.boxes.slice();
+    for (const [br, bc] of d.b) {
+      boxes[br] = boxes[br].slice();
+      boxes[br][bc] = owner as BoxOwner;
+    }
+  }
+  return {
+    ...prev,
+    board,
+    boxes,
+    scores: d.s ? { 1: d.s[0], 2: d.s[1] } : prev.scores,
+    currentPlayer: d.p ?? prev.currentPlayer,
+    winner: d.w ?? prev.winner,
+  };
+};
+
 /** ---- Component ---- */
 export const Dots_And_Boxes = () => {
   const [gameState, setGameState] = useState<GameState>({
@@ -60,10 +99,12 @@ export const Dots_And_Boxes = () => {
   const [player1, setEnablePlayer1] = useState<boolean>(true);
   const [player2, setEnablePlayer2] = useState<boolean>(true);
   const [errorText, setErrorText] = useState<string | null>(null);
+  const [aiLevel, setAiLevel] = useState<AiLevel>("medium");
 
   const wsRef = useRef<WebSocket | null>(null);
   const retryRef = useRef<number>(0);
   const pingTimer = useRef<number | null>(null);
+  const seqRef = useRef<number>(-1);  // last applied broadcast seq
 
   /** ---- WS connect / reconnect ---- */
   function connect() {
@@ -100,8 +141,21 @@ export const Dots_And_Boxes = () => {
     ws.onmessage = (ev) => {
       try {
         const msg: ServerMsg = JSON.parse(ev.data);
+        if (msg.type === "delta") {
+          if (seqRef.current >= 0 && msg.seq !== seqRef.current + 1) {
+            // Missed a broadcast: ask for a full snapshot and drop this one
+            seqRef.current = -1;
+            ws.send(JSON.stringify({ type: "sync" }));
+            return;
+          }
+          seqRef.current = msg.seq;
+          setGameState((prev) => applyDelta(prev, msg));
+          if (typeof msg.count === "number") setSpectators(Math.max(0, msg.count - 3));
+          return;
+        }
         if (msg.type === "state") {
-          const { type, count, ...state } = msg;
+          const { type, count, seq, ...state } = msg;
+          if (typeof seq === "number") seqRef.current = seq;
           setGameState(state as GameState);
           if (typeof count === "number") setSpectators(Math.max(0, count - 3)); // exclude players and dashboard
           // Enable Be 1 if !msg.players["1"], Be 2 if !msg.players["2"]
@@ -135,6 +189,11 @@ export const Dots_And_Boxes = () => {
     try { wsRef.current?.send(JSON.stringify({ type: "join", player: p })); } catch {}
   };
 
+  // Seat the computer opposite us, or (seat 0) send it away
+  const setComputer = (seat: PlayerOrSpectator) => {
+    try { wsRef.current?.send(JSON.stringify({ type: "ai", player: seat, level: aiLevel })); } catch {}
+  };
+
   const sendMove = (row: number, col: number, orientation: "h" | "v") => {
     if (!connected || !wsRef.current) return;
     if (gameState.winner !== 0) return;
@@ -243,6 +302,7 @@ export const Dots_And_Boxes = () => {
   };
 
   /** ---- Build the table grid ---- */
+  const DOTS = gameState.board.length;  // follows the server's board size
   const rows: preact.ComponentChild[] = [];
   for (let y = 0; y < DOTS * 2 - 1; y++) {
     const cells: preact.ComponentChild[] = [];
@@ -287,6 +347,23 @@ export const Dots_And_Boxes = () => {
           </button>
         </div>
 
+        <div>
+          <select value={aiLevel} onChange={(e) => setAiLevel((e.target as HTMLSelectElement).value as AiLevel)} style={{ padding: "6px 4px" }}>
+            <option value="easy">Easy</option>
+            <option value="medium">Medium</option>
+            <option value="hard">Hard</option>
+          </select>
+          {gameState.ai ? (
+            <button onPointerDown={() => setComputer(0)} style={{ marginLeft: 8, padding: "6px 10px", touchAction: "manipulation" }}>
+              Stop computer (P{gameState.ai}, {gameState.aiLevel})
+            </button>
+          ) : (
+            <button onPointerDown={() => setComputer(player === 2 ? 1 : 2)} style={{ marginLeft: 8, padding: "6px 10px", touchAction: "manipulation" }}>
+              Play the computer
+            </button>
+          )}
+        </div>
+
         <div><b>Status:</b> {connected ? "Connected" : "Reconnecting…"}{spectators > 0 && <span>&nbsp;• Spectators: {spectators}</span>}</div>
         <div><b>Turn:</b> P{gameState.currentPlayer}</div>
         <div><b>Score:</b> P1 {gameState.scores[1]} • P2 {gameState.scores[2]}</div>
@@ -1,28 +1,24 @@
 import { useEffect, useState, useRef } from "preact/hooks";
 import { Wordle } from "./_index";
-import { dictionary } from "../../../data/dictionary";
 
 export const Reactle = () => {
-    const [solution, setSolution] = useState("");
-    const [words, setWords] = useState([]);
-    const [wordHistory, setWordHistory] = useState([]);
+    // The server picks the solution and scores guesses; we only hold the game id
+    const [gameId, setGameId] = useState("");
     const [connectionStatus, setConnectionStatus] = useState("disconnected");
     const wsRef = useRef<WebSocket | null>(null);
 
-    const initializeGame = () => {
-        const dictWords = Object.keys(dictionary).filter(
-            dict => dict.length === 5 && !wordHistory.includes(dict)
-        );
-        setWords(dictWords);
-        const wordSize = dictWords.length;
-        if (wordSize === 0) {
-            console.log("No more words available.");
-            return;
+    const initializeGame = async () => {
+        try {
+            const res = await fetch("/api/wordle/new", { method: "POST" });
+            const game = await res.json();
+            if (!game.ok) {
+                console.log("No game started:", game.error);
+                return;
+            }
+            setGameId(game.id);
+        } catch (e) {
+            console.log("No game started:", e);
         }
-        let wordIndex = Math.floor(Math.random() * wordSize);
-        const newSolution = dictWords[wordIndex];
-        setSolution(newSolution);
-        console.log("solution", newSolution);
     };
 
     useEffect(() => {
@@ -61,7 +57,6 @@ export const Reactle = () => {
     }, []);
 
     const resetGame = () => {
-        setWordHistory(prevHistory => [...prevHistory, solution]);
         initializeGame();
     };
 
@@ -71,7 +66,7 @@ export const Reactle = () => {
             <div style={{ marginBottom: '1em' }}>
                 <strong>ESP32-S3 WebSocket:</strong> {connectionStatus}
             </div>
-            <Wordle solution={solution} words={words} resetGame={resetGame} />
+            <Wordle gameId={gameId} resetGame={resetGame} />
         </div>
     );
 };
@@ -1,5 +1,4 @@
 import { useState } from "preact/hooks";
-import { dictionary } from "../../../data/dictionary";
 import { Fragment } from 'preact';
 
 export const Modal = ({
@@ -10,6 +9,20 @@ export const Modal = ({
     closeModal,
 }) => {
     const [showDefn, setShowDefn] = useState(false);
+    const [definition, setDefinition] = useState<string | null>(null);
+
+    // Fetched from the device on first open instead of bundling the dictionary
+    const toggleDefn = async () => {
+        setShowDefn(prev => !prev);
+        if (definition !== null) return;
+        try {
+            const res = await fetch(`/api/wordle/define/${solution}`);
+            const data = await res.json();
+            setDefinition(data.ok ? data.definition : "No definition found.");
+        } catch (e) {
+            setDefinition("Definition unavailable.");
+        }
+    };
 
     let letters = solution.split("");
     const solutionBlock = (
@@ -46,12 +59,12 @@ export const Modal = ({
                 {solutionBlock}
                 <button
                     className="anchor"
-                    onClick={() => setShowDefn(prev => !prev)}
+                    onClick={toggleDefn}
                 >
                     What does it mean?
                 </button>
                 <div className={`meaning ${showDefn ? "show" : ""}`}>
-                    <p className="definition">{dictionary[solution]}</p>
+                    <p className="definition">{definition ?? "Loading..."}</p>
                 </div>
                 <button className="reset" onClick={newGame}>
                     Play Again
@@ -4,8 +4,9 @@ import { Grid, Keypad, Modal } from "./_index";
 import { useLocation } from "wouter";
 import letters from "../../../data/letters";
 
-export const Wordle = ({ words, solution, resetGame }) => {
+export const Wordle = ({ gameId, resetGame }) => {
     const {
+        solution,
         currentGuess,
         setCurrentGuess,
         guesses,
@@ -16,7 +17,7 @@ export const Wordle = ({ words, solution, resetGame }) => {
         setErrorMsg,
         usedKeys,
         reset
-    } = useWordle(words, solution);
+    } = useWordle(gameId);
     const [location, navigate] = useLocation();
 
     const [showModal, setShowModal] = useState(false);
@@ -1,33 +1,9 @@
 import { useEffect, useState, useRef } from "preact/hooks";
-import { dictionary } from "../../../data/dictionary";
 
 export const Tic_Tac_Toe = () => {
-    const [solution, setSolution] = useState("");
-    const [words, setWords] = useState([]);
-    const [wordHistory, setWordHistory] = useState([]);
     const [connectionStatus, setConnectionStatus] = useState("disconnected");
     const wsRef = useRef<WebSocket | null>(null);
 
-    const initializeGame = () => {
-        const dictWords = Object.keys(dictionary).filter(
-            dict => dict.length === 5 && !wordHistory.includes(dict)
-        );
-        setWords(dictWords);
-        const wordSize = dictWords.length;
-        if (wordSize === 0) {
-            console.log("No more words available.");
-            return;
-        }
-        let wordIndex = Math.floor(Math.random() * wordSize);
-        const newSolution = dictWords[wordIndex];
-        setSolution(newSolution);
-        console.log("solution", newSolution);
-    };
-
-    useEffect(() => {
-        initializeGame();
-    }, []);
-
     // Keep WebSocket connection open while page is loaded
     useEffect(() => {
         const wsProtocol = window.location.protocol === "https:" ? "wss" : "ws";
@@ -59,11 +35,6 @@ export const Tic_Tac_Toe = () => {
         return () => clearInterval(interval);
     }, []);
 
-    const resetGame = () => {
-        setWordHistory(prevHistory => [...prevHistory, solution]);
-        initializeGame();
-    };
-
     return (
         <div className="Apps">
             <h1>React Wordle</h1>
@@ -1,6 +1,9 @@
-import { useState } from "react";
+import { useRef, useState } from "react";
 
-const useWordle = (words, solution) => {
+// Guesses are checked and scored by the server (POST /api/wordle/guess);
+// the solution only arrives with the guess that ends the game.
+const useWordle = gameId => {
+    const [solution, setSolution] = useState("");
     const [turn, setTurn] = useState(0);
     const [currentGuess, setCurrentGuess] = useState("");
     const [guesses, setGuesses] = useState([...Array(6)]); // [[{key: "a", color: "green"}, {key: "s", color:"grey"}]]
@@ -9,8 +12,10 @@ const useWordle = (words, solution) => {
     const [usedKeys, setUsedKeys] = useState({}); //{a: "green", s: "yellow"}
     //error handling
     const [errorMsg, setErrorMsg] = useState("");
+    const checking = useRef(false); // one guess in flight at a time
 
     const reset = () => {
+        setSolution("");
         setTurn(0);
         setCurrentGuess("");
         setGuesses([...Array(6)]);
@@ -20,40 +25,34 @@ const useWordle = (words, solution) => {
         setErrorMsg("");
     };
 
-    // format a guess into an array of letter objects
+    // format a guess into an array of letter objects using the server's marks
     // e.g. [{key: 'a', color: 'yellow'}]
-    const formatGuess = () => {
-        let solutionArray = [...solution];
-
-        let formattedGuess = [...currentGuess].map(l => {
-            return { key: l, color: "grey" };
-        });
-
-        //find green letters
-        formattedGuess.forEach((l, i) => {
-            if (solutionArray[i] === l.key) {
-                solutionArray[i] = null;
-                formattedGuess[i].color = "green";
-            }
+    const formatGuess = marks => {
+        return [...currentGuess].map((l, i) => {
+            return { key: l, color: marks[i] };
         });
+    };
 
-        //find yellow letter; if green, ignore
-        formattedGuess.forEach((l, i) => {
-            if (solutionArray.includes(l.key) && l.color !== "green") {
-                solutionArray[solutionArray.indexOf(l.key)] = null;
-                formattedGuess[i].color = "yellow";
-            }
+    // ask the server to check and score the current guess
+    const checkGuess = async () => {
+        const res = await fetch("/api/wordle/guess", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ id: gameId, guess: currentGuess }),
         });
-        return formattedGuess;
+        return res.json();
     };
 
     // add a new guess to the guesses state
     // update the isCorrect state if the guess is correct
     // add one to the turn state
-    const addNewGuess = formattedGuess => {
-        if (currentGuess === solution) {
+    const addNewGuess = (formattedGuess, result) => {
+        if (result.correct) {
             setIsCorrect(true);
         }
+        if (result.solution) {
+            setSolution(result.solution);
+        }
 
         setGuesses(prevGuesses => {
             let guesses = [...prevGuesses];
@@ -96,7 +95,10 @@ const useWordle = (words, solution) => {
 
     // handle keyup event & track current guess
     // if user presses enter, add the new guess
-    const handleKeyUp = ({ key }) => {
+    const handleKeyUp = async ({ key }) => {
+        if (checking.current) {
+            return;
+        }
         if (key === "Enter") {
             // only add guess if turn is less than 5
             // do not allow duplicate words
@@ -116,12 +118,26 @@ const useWordle = (words, solution) => {
                 console.log("word must be 5 chars.");
                 return;
             }
-            if (!words.includes(currentGuess)) {
-                setErrorMsg("No such words in library!!.");
-                console.log("no words in library");
+            if (!gameId) {
+                setErrorMsg("No game server!!");
+                return;
+            }
+            checking.current = true;
+            let result;
+            try {
+                result = await checkGuess();
+            } catch (e) {
+                result = { ok: false, error: "No game server!!" };
+            } finally {
+                checking.current = false;
+            }
+            if (!result.ok || !result.valid) {
+                setErrorMsg(result.error || "No such words in library!!.");
+                console.log("guess rejected:", result.error);
                 return;
             }
-            addNewGuess(formatGuess());
+            addNewGuess(formatGuess(result.marks), result);
+            return;
         }
         if (key === "Backspace") {
             setErrorMsg("");
@@ -136,6 +152,7 @@ const useWordle = (words, solution) => {
     };
 
     return {
+        solution,
         currentGuess,
         setCurrentGuess,
         turn,
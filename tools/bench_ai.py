@@ -0,0 +1,125 @@
+# bench_ai.py
+# Host-side benchmark for the Dots & Boxes computer player (esp_portal/_dnb_ai.py).
+#
+# Plays whole games between two levels through the real DotsAndBoxes room,
+# driving it the way the server loop does: one _tick() per iteration, each
+# thinking for at most SLICE_MS. Reports search speed (nodes/s), the depth the
+# iterative deepening reached, how long single slices took (what another
+# socket could wait behind the computer), and the score.
+#
+#   python tools/bench_ai.py [--size 8] [--games 4] [--levels hard,easy] [--slice-ms 4] [--json]
+
+import argparse, json, os, random, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "circuitpy"))
+
+from esp_portal._dots_and_boxes import DotsAndBoxes  # noqa: E402
+from esp_portal._dnb_ai import DnBAI, LEVELS  # noqa: E402
+
+
+class Seat:
+    """Stats for one computer seat across all games."""
+
+    def __init__(self, level):
+        self.level = level
+        self.nodes = 0
+        self.think_s = 0.0
+        self.moves = 0
+        self.depths = []
+        self.slices = []
+        self.wins = 0
+        self.boxes = 0
+
+
+def play(room, seats, slice_us):
+    engine = room.engine
+    ais = {p: DnBAI(engine, p, seats[p].level) for p in (1, 2)}
+    while engine.drawn < engine.edge_count:
+        p = engine.current
+        room.ai = ais[p]  # the room drives whichever seat is to move
+        t0 = time.perf_counter()
+        move_start = t0
+        while engine.current == p and engine.drawn < engine.edge_count:
+            drawn = engine.drawn
+            room._tick()
+            t1 = time.perf_counter()
+            seats[p].slices.append(t1 - t0)
+            t0 = t1
+            if engine.drawn != drawn:
+                seats[p].moves += 1
+                seats[p].nodes += ais[p].nodes
+                seats[p].depths.append(ais[p].depth)
+                seats[p].think_s += t1 - move_start
+                move_start = t1
+        room.dirty = False  # nobody's listening; skip the push
+    for p in (1, 2):
+        seats[p].boxes += engine.scores[p]
+    if engine.winner:
+        seats[engine.winner].wins += 1
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Dots & Boxes computer player benchmark.")
+    ap.add_argument("--size", type=int, default=8, help="dots per side")
+    ap.add_argument("--games", type=int, default=4)
+    ap.add_argument("--levels", default="hard,easy", help="player 1 level,player 2 level")
+    ap.add_argument("--slice-ms", type=float, default=4)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    levels = args.levels.split(",")
+    if len(levels) != 2 or any(lv not in LEVELS for lv in levels):
+        ap.error(f"--levels takes two of {', '.join(LEVELS)}")
+    random.seed(args.seed)
+    DotsAndBoxes.board_size = args.size
+    slice_us = int(args.slice_ms * 1000)
+    DotsAndBoxes.ai_slice_us = slice_us
+
+    room = DotsAndBoxes("bench")
+    seats = {1: Seat(levels[0]), 2: Seat(levels[1])}
+    for g in range(args.games):
+        # alternate who opens so neither level keeps the first move
+        if g % 2:
+            seats[1], seats[2] = seats[2], seats[1]
+        room._reset_game()
+        play(room, seats, slice_us)
+        if g % 2:
+            seats[1], seats[2] = seats[2], seats[1]
+
+    rows = []
+    for p in (1, 2):
+        s = seats[p]
+        rows.append({
+            "level": s.level,
+            "moves": s.moves,
+            "nodes": s.nodes,
+            "nodes_per_s": int(s.nodes / s.think_s) if s.think_s else 0,
+            "think_ms_per_move": round(1000 * s.think_s / s.moves, 1) if s.moves else 0,
+            "depth_median": pct(s.depths, 0.5),
+            "depth_max": max(s.depths) if s.depths else 0,
+            "slice_p99_ms": round(1000 * pct(s.slices, 0.99), 2),
+            "slice_max_ms": round(1000 * max(s.slices), 2) if s.slices else 0,
+            "wins": s.wins,
+            "boxes": s.boxes,
+        })
+
+    if args.json:
+        print(json.dumps({"size": args.size, "games": args.games, "slice_ms": args.slice_ms, "seats": rows}))
+        return
+    print(f"{args.games} games on {args.size}x{args.size} dots, {args.slice_ms} ms slices")
+    print(f"{'level':<8}{'nodes/s':>10}{'ms/move':>9}{'depth':>7}{'max':>5}"
+          f"{'slice p99':>11}{'slice max':>11}{'wins':>6}{'boxes':>7}")
+    for r in rows:
+        print(f"{r['level']:<8}{r['nodes_per_s']:>10}{r['think_ms_per_move']:>9}"
+              f"{r['depth_median']:>7}{r['depth_max']:>5}{r['slice_p99_ms']:>11}"
+              f"{r['slice_max_ms']:>11}{r['wins']:>6}{r['boxes']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# bench_scheduler.py
+# Host-side benchmark: fixed 10 ms poll-everything loop vs. esp_portal Scheduler
+# vs. the asyncio core (SCHEDULER MODE "ASYNC").
+#
+# Runs the real DotsAndBoxes game class against fake websockets. A feeder thread
+# drops moves into one client's inbox at random intervals; we measure the time
+# from a move arriving to its broadcast going out, plus how often the loop wakes
+# up while nothing is connected.
+#
+#   python tools/bench_scheduler.py [--seconds 5] [--rate 20] [--json]
+
+import argparse, asyncio, json, os, random, sys, threading, time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "circuitpy"))
+
+from esp_portal._dots_and_boxes import DotsAndBoxes  # noqa: E402
+from esp_portal._scheduler import Scheduler  # noqa: E402
+from esp_portal._async_core import AsyncCore  # noqa: E402
+
+
+class FakeWS:
+    """Just enough of adafruit_httpserver.Websocket for the game classes."""
+
+    def __init__(self, probe=None):
+        self.inbox = deque()
+        self.probe = probe
+        self.client_address = ("127.0.0.1", 0)
+
+    def receive(self):
+        if self.inbox:
+            arrived, msg = self.inbox.popleft()
+            if self.probe is not None:
+                self.probe.pending.append(arrived)
+            return msg
+        return None
+
+    def send_message(self, data):
+        if self.probe is not None:
+            self.probe.on_send()
+
+    def close(self):
+        pass
+
+
+class Probe:
+    def __init__(self):
+        self.pending = deque()
+        self.latencies = []
+
+    def on_send(self):
+        # Rooms coalesce a tick's moves into one push, so a send covers
+        # every move read before it
+        now = time.monotonic()
+        while self.pending:
+            self.latencies.append(now - self.pending.popleft())
+
+
+def _edges(size):
+    for r in range(size):
+        for c in range(size - 1):
+            yield "h", r, c
+    for r in range(size - 1):
+        for c in range(size):
+            yield "v", r, c
+
+
+def feeder(ws, stop, rate):
+    moves = list(_edges(8))
+    i = 0
+    while not stop.is_set():
+        time.sleep(random.expovariate(rate))
+        if i == len(moves):
+            msg, i = {"type": "reset"}, 0
+        else:
+            t, r, c = moves[i]
+            msg, i = {"type": "move", "t": t, "r": r, "c": c}, i + 1
+        ws.inbox.append((time.monotonic(), json.dumps(msg)))
+
+
+def _reset_game_class():
+    DotsAndBoxes.rooms.clear()
+
+
+def baseline_loop(games, stop, counter):
+    while not stop.is_set():
+        for g in games:
+            g.poll()
+        counter[0] += 1
+        time.sleep(0.01)
+
+
+def scheduler_loop(games, stop, counter):
+    sched = Scheduler(lambda: False, games, {})
+    while not stop.is_set():
+        delay = sched.tick()
+        counter[0] += 1
+        if delay:
+            time.sleep(delay)
+
+
+def async_loop(games, stop, counter):
+    def poll_http():
+        counter[0] += 1  # the HTTP task is the only thing awake while idle
+        return False
+
+    async def main():
+        task = asyncio.create_task(AsyncCore(poll_http, games, {}).run())
+        while not stop.is_set():
+            await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(main())
+
+
+def run_active(loop, seconds, rate):
+    _reset_game_class()
+    probe = Probe()
+    mover = FakeWS(probe)
+    DotsAndBoxes.handle_ws(mover)
+    DotsAndBoxes.handle_ws(FakeWS())
+    stop = threading.Event()
+    counter = [0]
+    feed = threading.Thread(target=feeder, args=(mover, stop, rate))
+    feed.start()
+    cpu = time.process_time()
+    worker = threading.Thread(target=loop, args=([DotsAndBoxes], stop, counter))
+    worker.start()
+    time.sleep(seconds)
+    stop.set()
+    feed.join()
+    worker.join()
+    cpu = time.process_time() - cpu
+    lat = sorted(probe.latencies)
+    return {
+        "moves": len(lat),
+        "p50_ms": _pct(lat, 50) * 1000,
+        "p95_ms": _pct(lat, 95) * 1000,
+        "max_ms": (lat[-1] if lat else 0) * 1000,
+        "ticks_per_s": counter[0] / seconds,
+        "cpu_s": cpu,
+    }
+
+
+def run_idle(loop, seconds):
+    _reset_game_class()
+    stop = threading.Event()
+    counter = [0]
+    cpu = time.process_time()
+    worker = threading.Thread(target=loop, args=([DotsAndBoxes], stop, counter))
+    worker.start()
+    time.sleep(seconds)
+    stop.set()
+    worker.join()
+    return {"wakeups_per_s": counter[0] / seconds, "cpu_s": time.process_time() - cpu}
+
+
+def _pct(values, p):
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))
+    return values[k]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare the fixed-sleep loop, the adaptive scheduler and the asyncio core.")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--rate", type=float, default=20.0, help="moves per second")
+    ap.add_argument("--json", action="store_true", help="machine-readable output")
+    args = ap.parse_args()
+
+    results = {}
+    for name, loop in (("baseline", baseline_loop), ("scheduler", scheduler_loop), ("async", async_loop)):
+        results[name] = {
+            "active": run_active(loop, args.seconds, args.rate),
+            "idle": run_idle(loop, args.seconds),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, res in results.items():
+        a, i = res["active"], res["idle"]
+        print(f"{name:10s} moves={a['moves']:5d} p50={a['p50_ms']:6.2f}ms "
+              f"p95={a['p95_ms']:6.2f}ms max={a['max_ms']:6.2f}ms "
+              f"ticks/s={a['ticks_per_s']:8.1f} | idle wakeups/s={i['wakeups_per_s']:6.1f} "
+              f"idle cpu={i['cpu_s']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+# bench_ws.py
+# Websocket load test for the game endpoints.
+#
+# Boots the app under tools/hostsim (or targets --url), opens N clients per
+# game endpoint, and replays a move stream from one "driver" client per
+# endpoint. Each move is timed until every client in that endpoint has the
+# broadcast; endpoints run concurrently. Results are JSON so runs can be
+# diffed across commits (--out, --compare).
+#
+#   python tools/bench_ws.py --clients 4 --moves 200 --out bench.json
+#   python tools/bench_ws.py --compare bench.json
+#   python tools/bench_ws.py --mode ASYNC --compare bench.json
+
+import argparse, json, os, selectors, shutil, socket, subprocess, sys, tempfile, threading, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(HERE, "hostsim"))
+
+from wsclient import WSClient  # noqa: E402
+
+ENDPOINTS = ("dots-and-boxes", "tic-tac-toe", "battleship", "rock-paper-scissors")
+BROADCAST_TYPES = ("state", "delta")
+
+
+def default_script(board_size=8):
+    """All edges of an empty board in order, then a reset; moves go to the current player."""
+    moves = []
+    for r in range(board_size):
+        for c in range(board_size - 1):
+            moves.append({"type": "move", "t": "h", "r": r, "c": c})
+    for r in range(board_size - 1):
+        for c in range(board_size):
+            moves.append({"type": "move", "t": "v", "r": r, "c": c})
+    moves.append({"type": "reset"})
+    return moves
+
+
+def load_script(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _is_broadcast(message):
+    if isinstance(message, bytes):
+        return True  # binary protocol frames are always state
+    try:
+        return json.loads(message).get("type") in BROADCAST_TYPES
+    except (ValueError, AttributeError):
+        return False
+
+
+class EndpointRun(threading.Thread):
+    def __init__(self, url, clients, script, moves, timeout):
+        super().__init__(daemon=True)
+        self.url = url
+        self.count = clients
+        self.script = script
+        self.moves = moves
+        self.timeout = timeout
+        self.latencies = []
+        self.errors = 0
+        self.elapsed = 0.0
+        self.failure = None
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as e:  # report, don't hang the whole benchmark
+            self.failure = repr(e)
+
+    def _wait_all(self, clients, deadline):
+        """Wait until each client has seen a broadcast; returns arrival times."""
+        sel = selectors.DefaultSelector()
+        pending = {}
+        arrivals = []
+        for ws in clients:
+            if ws._buf:
+                # already buffered data: drain without blocking on the socket
+                pending[ws] = True
+            sel.register(ws.sock, selectors.EVENT_READ, ws)
+        waiting = set(clients)
+        while waiting:
+            for ws in list(pending):
+                pending.pop(ws)
+                if ws in waiting and self._drain(ws):
+                    arrivals.append(time.perf_counter())
+                    waiting.discard(ws)
+            if not waiting:
+                break
+            left = deadline - time.perf_counter()
+            if left <= 0:
+                raise TimeoutError(f"{len(waiting)} client(s) missed a broadcast")
+            for key, _ in sel.select(left):
+                pending[key.data] = True
+        sel.close()
+        return arrivals
+
+    def _drain(self, ws):
+        """Read frames already available; True once a broadcast was seen."""
+        seen = False
+        while True:
+            try:
+                msg = ws.recv(timeout=0)
+            except (socket.timeout, BlockingIOError):
+                return seen
+            if msg is None:
+                raise ConnectionError("server closed the socket")
+            if _is_broadcast(msg):
+                seen = True
+            if not ws._buf:
+                return seen
+
+    def _run(self):
+        clients = [WSClient(self.url, timeout=self.timeout) for _ in range(self.count)]
+        try:
+            # every client gets its initial state first
+            self._wait_all(clients, time.perf_counter() + self.timeout)
+            driver = clients[0]
+            start = time.perf_counter()
+            for i in range(self.moves):
+                msg = self.script[i % len(self.script)]
+                driver.sock.settimeout(self.timeout)  # _drain() leaves it non-blocking
+                sent = time.perf_counter()
+                driver.send(json.dumps(msg))
+                try:
+                    arrivals = self._wait_all(clients, sent + self.timeout)
+                except TimeoutError:
+                    self.errors += 1
+                    continue
+                self.latencies.extend(t - sent for t in arrivals)
+            self.elapsed = time.perf_counter() - start
+        finally:
+            for ws in clients:
+                ws.close()
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))
+    return values[k]
+
+
+def summarize(latencies, moves, elapsed, errors):
+    lat = sorted(latencies)
+    ms = lambda v: round(v * 1000, 3)  # noqa: E731
+    return {
+        "moves": moves,
+        "errors": errors,
+        "samples": len(lat),
+        "p50_ms": ms(percentile(lat, 50)),
+        "p95_ms": ms(percentile(lat, 95)),
+        "p99_ms": ms(percentile(lat, 99)),
+        "max_ms": ms(lat[-1] if lat else 0),
+        "mean_ms": ms(sum(lat) / len(lat) if lat else 0),
+        "moves_per_s": round(moves / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_local_server(www=None, mode=None):
+    """Boot circuitpy/main.py under the host harness on a scratch drive."""
+    root = tempfile.mkdtemp(prefix="esp-bench-")
+    with open(os.path.join(REPO, "circuitpy", "config.json")) as f:
+        config = json.load(f)
+    config["MODE"] = "WIFI"
+    if mode:
+        config.setdefault("SCHEDULER", {})["MODE"] = mode
+    with open(os.path.join(root, "config.json"), "w") as f:
+        json.dump(config, f)
+    shutil.copy(os.path.join(REPO, "circuitpy", "leaderboard.json"), root)
+    if www is None:
+        www = os.path.join(root, "_www")
+        os.mkdir(www)
+        with open(os.path.join(www, "index.html"), "w") as f:
+            f.write("<!doctype html><title>bench</title>")
+    port = _free_port()
+    log = open(os.path.join(root, "server.log"), "wb")
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "hostsim", "run.py"),
+         "--root", root, "--www", www, "--port", str(port)],
+        stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, root, f"ws://127.0.0.1:{port}"
+        except OSError:
+            if proc.poll() is not None:
+                with open(log.name) as f:
+                    raise RuntimeError(f.read())
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("host server did not start")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "-C", REPO, "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(base_url, endpoints, clients, moves, script, timeout, query=""):
+    runs = {}
+    for name in endpoints:
+        runs[name] = EndpointRun(f"{base_url}/ws/{name}{query}", clients, script, moves, timeout)
+    for r in runs.values():
+        r.start()
+    for r in runs.values():
+        r.join()
+    result = {"endpoints": {}}
+    everything = []
+    total_moves = total_errors = 0
+    elapsed = 0.0
+    for name, r in runs.items():
+        if r.failure:
+            result["endpoints"][name] = {"failure": r.failure}
+            continue
+        result["endpoints"][name] = summarize(r.latencies, moves, r.elapsed, r.errors)
+        everything += r.latencies
+        total_moves += moves
+        total_errors += r.errors
+        elapsed = max(elapsed, r.elapsed)
+    result["overall"] = summarize(everything, total_moves, elapsed, total_errors)
+    return result
+
+
+def compare(old, new):
+    keys = ("p50_ms", "p95_ms", "p99_ms", "moves_per_s")
+    print(f"{'endpoint':22s} " + " ".join(f"{k:>22s}" for k in keys))
+    for name in list(new["endpoints"]) + ["overall"]:
+        a = old["overall"] if name == "overall" else old["endpoints"].get(name, {})
+        b = new["overall"] if name == "overall" else new["endpoints"].get(name, {})
+        cells = []
+        for k in keys:
+            if k in a and k in b:
+                change = (b[k] - a[k]) / a[k] * 100 if a[k] else 0.0
+                cells.append(f"{a[k]:8.2f}->{b[k]:8.2f} {change:+5.0f}%")
+            else:
+                cells.append(f"{'n/a':>22s}")
+        print(f"{name:22s} " + " ".join(cells))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Websocket move-to-broadcast latency benchmark.")
+    ap.add_argument("--url", help="target a running server (ws://host:port) instead of booting one")
+    ap.add_argument("--www", help="web root for the local server")
+    ap.add_argument("--clients", type=int, default=4, help="clients per endpoint")
+    ap.add_argument("--moves", type=int, default=200, help="moves per endpoint")
+    ap.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    ap.add_argument("--script", help="JSON-lines move stream to replay (default: fill the board, reset)")
+    ap.add_argument("--query", default="", help="query string appended to every /ws URL, e.g. ?room=a")
+    ap.add_argument("--mode", type=str.upper, choices=("TICK", "ASYNC"),
+                    help="SCHEDULER MODE for the local server")
+    ap.add_argument("--timeout", type=float, default=5.0)
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--compare", help="previous results JSON to compare against")
+    args = ap.parse_args()
+
+    script = load_script(args.script) if args.script else default_script()
+    proc = root = None
+    base = args.url
+    if base is None:
+        proc, root, base = start_local_server(args.www, args.mode)
+    try:
+        result = run(base, args.endpoints.split(","), args.clients, args.moves, script,
+                     args.timeout, args.query)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+            shutil.rmtree(root, ignore_errors=True)
+    result["meta"] = {
+        "commit": git_commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "clients": args.clients,
+        "moves": args.moves,
+        "target": args.url or "hostsim",
+        "query": args.query,
+    }
+    text = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), result)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
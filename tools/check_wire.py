@@ -0,0 +1,120 @@
+# check_wire.py
+# Round-trip checks and size/time comparison for esp_portal/_wire.py.
+#
+# Plays random Dots & Boxes games with the real game class and checks that
+# every snapshot, delta and client frame survives encode -> decode unchanged,
+# then prints payload sizes and encode/decode cost against the JSON messages.
+#
+#   python tools/check_wire.py [--games 50] [--seed 1]
+
+import argparse, json, os, random, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "circuitpy"))
+
+from esp_portal import _wire  # noqa: E402
+from esp_portal._dots_and_boxes import DotsAndBoxes  # noqa: E402
+
+
+def _edges(size):
+    return [("h", r, c) for r in range(size) for c in range(size - 1)] + \
+           [("v", r, c) for r in range(size - 1) for c in range(size)]
+
+
+def _expect(label, got, want):
+    if got != want:
+        raise AssertionError(f"{label}:\n  got  {got}\n  want {want}")
+
+
+def check_game(rng, seq):
+    game = DotsAndBoxes("check")
+    if rng.random() < 0.5:
+        # a seated computer rides along in the turn byte
+        game._seat_ai(rng.choice((1, 2)), rng.choice(_wire.AI_LEVELS))
+    moves = _edges(game.BOARD_SIZE)
+    rng.shuffle(moves)
+    checked = 0
+    for t, r, c in moves:
+        player = game.game_state["currentPlayer"]
+        game.delta = None
+        if not game._apply_move(player, t, r, c):
+            raise AssertionError(f"move rejected: {t} {r} {c}")
+        seq += 1
+        count = rng.randint(-1, 12)
+
+        want = {"type": "state", "seq": seq, "count": count}
+        want.update(json.loads(json.dumps(game.game_state)))
+        want["scores"] = dict(game.game_state["scores"])
+        _expect("state", _wire.decode_server(_wire.encode_state(seq, game.game_state, count)), want)
+
+        want = {"type": "delta", "seq": seq}
+        want.update(game.delta)
+        _expect("delta", _wire.decode_server(_wire.encode_delta(seq, game.delta)), want)
+
+        msg = {"type": "move", "t": t, "r": r, "c": c}
+        if rng.random() < 0.5:
+            msg["player"] = player
+        _expect("move", _wire.decode_client(_wire.encode_client(msg)), msg)
+        checked += 3
+    return seq, checked
+
+
+def check_misc():
+    for msg in ({"type": "reset"}, {"type": "sync"}, {"type": "ping"}, {"type": "join", "player": 2}):
+        _expect(msg["type"], _wire.decode_client(_wire.encode_client(msg)), msg)
+    _expect("count", _wire.decode_server(_wire.encode_delta(7, {"count": 3})),
+            {"type": "delta", "seq": 7, "count": 3})
+    _expect("pong", _wire.decode_server(bytes((_wire.PONG,))), {"type": "pong"})
+    _expect("short move", _wire.decode_client(bytes((_wire.MOVE, 0))), None)
+    # seq wraps at 32 bits rather than failing to pack
+    _expect("seq wrap", _wire.decode_server(_wire.encode_delta(2 ** 32 + 5, {"count": 0}))["seq"], 5)
+    return 8
+
+
+def _time(fn, n=2000):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def compare():
+    game = DotsAndBoxes("compare")
+    for t, r, c in _edges(game.BOARD_SIZE)[::3]:
+        game._apply_move(game.game_state["currentPlayer"], t, r, c)
+    state_json = game._state_message()
+    delta_json = game._delta_message(game.delta)
+    state_bin = _wire.encode_state(1, game.game_state, 2)
+    delta_bin = _wire.encode_delta(1, game.delta)
+    move_json = json.dumps({"type": "move", "t": "h", "r": 3, "c": 4})
+    move_bin = _wire.encode_client({"type": "move", "t": "h", "r": 3, "c": 4})
+    rows = (
+        ("state", state_json, state_bin, game._state_message,
+         lambda: _wire.encode_state(1, game.game_state, 2)),
+        ("delta", delta_json, delta_bin, lambda: game._delta_message(game.delta),
+         lambda: _wire.encode_delta(1, game.delta)),
+        ("move (parse)", move_json, move_bin, lambda: json.loads(move_json),
+         lambda: _wire.decode_client(move_bin)),
+    )
+    print(f"{'message':14s} {'json B':>7s} {'bin B':>6s} {'json us':>8s} {'bin us':>7s}")
+    for name, a, b, fa, fb in rows:
+        print(f"{name:14s} {len(a):7d} {len(b):6d} {_time(fa):8.2f} {_time(fb):7.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Round-trip checks for the binary game wire format.")
+    ap.add_argument("--games", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    seq = checked = 0
+    for _ in range(args.games):
+        seq, n = check_game(rng, seq)
+        checked += n
+    checked += check_misc()
+    print(f"ok: {checked} round trips over {args.games} games")
+    compare()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# gzip_www.py
+# Pre-compress the Vite build for the device: writes a <file>.gz next to every
+# text asset that actually shrinks, so ESPServer/PortalServer can send it with
+# Content-Encoding: gzip. Originals are kept for clients without gzip.
+#
+#   npm run build && python tools/gzip_www.py dist
+
+import argparse, gzip, os
+
+COMPRESSIBLE = (".html", ".js", ".mjs", ".css", ".svg", ".json", ".txt", ".map")
+
+
+def compress_tree(root, min_size=256, min_saving=0.1):
+    saved = 0
+    for folder, _, files in os.walk(root):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            path = os.path.join(folder, name)
+            with open(path, "rb") as f:
+                raw = f.read()
+            if len(raw) < min_size:
+                continue
+            # mtime=0 keeps the output byte-identical between builds
+            packed = gzip.compress(raw, compresslevel=9, mtime=0)
+            if len(packed) > len(raw) * (1 - min_saving):
+                continue
+            with open(path + ".gz", "wb") as f:
+                f.write(packed)
+            saved += len(raw) - len(packed)
+            print(f"{os.path.relpath(path, root):50s} {len(raw):8d} -> {len(packed):8d}")
+    print(f"saved {saved} bytes on the wire")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write .gz siblings for a built _www tree.")
+    ap.add_argument("root", nargs="?", default="dist")
+    ap.add_argument("--min-size", type=int, default=256, help="skip files smaller than this")
+    args = ap.parse_args()
+    compress_tree(args.root, args.min_size)
+
+
+if __name__ == "__main__":
+    main()
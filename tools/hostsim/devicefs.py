@@ -0,0 +1,70 @@
+# devicefs.py
+# Maps the CIRCUITPY drive onto a host directory.
+# Device code opens absolute paths ("/config.json", "/_www/index.html"); on a
+# host those are redirected into --root (and --www for the web root) by
+# wrapping open() and the handful of os functions the code base calls.
+
+import builtins, os
+
+_real_open = builtins.open
+_real = {name: getattr(os, name) for name in ("stat", "listdir", "remove", "rename", "mkdir", "rmdir")}
+
+_mounts = []  # (device_prefix, host_dir), longest prefix first
+
+
+def _exists(path):
+    # os.path.exists() would call the wrapped os.stat
+    try:
+        _real["stat"](path)
+        return True
+    except OSError:
+        return False
+
+
+def translate(path):
+    """Returns the host path for a device path; other paths pass through."""
+    if not isinstance(path, str) or not path.startswith("/"):
+        return path
+    for prefix, host_dir in _mounts:
+        if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+            return os.path.join(host_dir, path[len(prefix):].lstrip("/"))
+    return path
+
+
+def _on_device(path):
+    # Top-level entries of the drive, plus new top-level files (tmp/backup
+    # files written next to leaderboard.json) that don't exist on the host.
+    if not isinstance(path, str) or not path.startswith("/"):
+        return False
+    for prefix, _ in _mounts[:-1]:
+        if path == prefix or path.startswith(prefix + "/"):
+            return True
+    head = path[1:].split("/", 1)[0]
+    root = _mounts[-1][1]
+    if _exists(os.path.join(root, head)):
+        return True
+    return "/" not in path[1:] and not _exists(path)
+
+
+def _wrap(func):
+    def wrapper(path, *args, **kwargs):
+        return func(translate(path) if _on_device(path) else path, *args, **kwargs)
+    return wrapper
+
+
+def _rename(src, dst):
+    src = translate(src) if _on_device(src) else src
+    dst = translate(dst) if _on_device(dst) else dst
+    return _real["rename"](src, dst)
+
+
+def install(root, www=None):
+    """Mount `root` as "/" and optionally `www` as "/_www"."""
+    _mounts.clear()
+    if www:
+        _mounts.append(("/_www", os.path.abspath(www)))
+    _mounts.append(("/", os.path.abspath(root)))
+    builtins.open = _wrap(_real_open)
+    for name in ("stat", "listdir", "remove", "mkdir", "rmdir"):
+        setattr(os, name, _wrap(_real[name]))
+    os.rename = _rename
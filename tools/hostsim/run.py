@@ -0,0 +1,47 @@
+# run.py
+# Boot the unmodified circuitpy app on a Linux/macOS host.
+#
+# shims/ stands in for wifi, socketpool, mdns and adafruit_httpserver on top of
+# CPython sockets; devicefs maps the CIRCUITPY drive onto a host folder. Then
+# main.main() runs exactly as it would on the board.
+#
+#   npm run build
+#   python tools/hostsim/run.py --www dist --port 8080
+#   open http://127.0.0.1:8080/   (websockets on ws://127.0.0.1:8080/ws/...)
+
+import argparse, os, sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CIRCUITPY = os.path.abspath(os.path.join(HERE, "..", "..", "circuitpy"))
+
+
+def boot(root=CIRCUITPY, www=None, port=8080, host="127.0.0.1"):
+    """Mount the drive, put the shims ahead of everything and run main()."""
+    os.environ["ESP_HOST_PORT"] = str(port)
+    os.environ["ESP_HOST_IP"] = host
+    for path in (HERE, CIRCUITPY, os.path.join(HERE, "shims")):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    import devicefs
+    devicefs.install(root, www)
+    import main
+    main.main()
+
+
+def cli():
+    ap = argparse.ArgumentParser(description="Run the circuitpy app on this machine.")
+    ap.add_argument("--root", default=CIRCUITPY,
+                    help="folder mounted as the CIRCUITPY drive (config.json, leaderboard.json)")
+    ap.add_argument("--www", default=None,
+                    help="built web root mounted at /_www (default: <root>/_www)")
+    ap.add_argument("--port", type=int, default=8080, help="port to bind instead of 80")
+    ap.add_argument("--host", default="127.0.0.1", help="address reported by wifi.radio")
+    args = ap.parse_args()
+    try:
+        boot(args.root, args.www, args.port, args.host)
+    except KeyboardInterrupt:
+        print("\n[hostsim] stopped")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,40 @@
+# adafruit_httpserver (host shim)
+# The subset of Adafruit's CircuitPython HTTP server the ESP-REACTLE device code
+# uses, re-implemented on CPython sockets for tools/hostsim.
+
+from .headers import Headers
+from .methods import GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS, TRACE, CONNECT
+from .mime_types import MIMETypes
+from .request import Request, QueryParams
+from .response import Response, JSONResponse, FileResponse, ChunkedResponse, Websocket
+from .route import Route, as_route
+from .server import (
+    Server,
+    NO_REQUEST,
+    CONNECTION_TIMED_OUT,
+    REQUEST_HANDLED_NO_RESPONSE,
+    REQUEST_HANDLED_RESPONSE_SENT,
+    FILE_NOT_FOUND,
+)
+from .status import (
+    Status,
+    SWITCHING_PROTOCOLS_101,
+    OK_200,
+    CREATED_201,
+    ACCEPTED_202,
+    NO_CONTENT_204,
+    PARTIAL_CONTENT_206,
+    MOVED_PERMANENTLY_301,
+    FOUND_302,
+    TEMPORARY_REDIRECT_307,
+    PERMANENT_REDIRECT_308,
+    BAD_REQUEST_400,
+    UNAUTHORIZED_401,
+    FORBIDDEN_403,
+    NOT_FOUND_404,
+    METHOD_NOT_ALLOWED_405,
+    TOO_MANY_REQUESTS_429,
+    INTERNAL_SERVER_ERROR_500,
+    NOT_IMPLEMENTED_501,
+    SERVICE_UNAVAILABLE_503,
+)
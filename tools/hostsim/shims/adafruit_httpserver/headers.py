@@ -0,0 +1,46 @@
+# headers.py (host shim of adafruit_httpserver.headers)
+
+
+class Headers:
+    """Case-insensitive header mapping that remembers the original spelling."""
+
+    def __init__(self, headers=None):
+        self._storage = {}
+        if isinstance(headers, Headers):
+            self._storage = dict(headers._storage)
+        elif headers:
+            for key, value in headers.items():
+                self[key] = value
+
+    def get(self, name, default=None):
+        return self._storage.get(name.lower(), (None, default))[1]
+
+    def setdefault(self, name, default=None):
+        return self._storage.setdefault(name.lower(), (name, default))[1]
+
+    def items(self):
+        return [(k, v) for k, v in self._storage.values()]
+
+    def keys(self):
+        return [k for k, _ in self._storage.values()]
+
+    def copy(self):
+        return Headers(self)
+
+    def __getitem__(self, name):
+        return self._storage[name.lower()][1]
+
+    def __setitem__(self, name, value):
+        self._storage[name.lower()] = (name, value)
+
+    def __delitem__(self, name):
+        del self._storage[name.lower()]
+
+    def __contains__(self, name):
+        return name.lower() in self._storage
+
+    def __len__(self):
+        return len(self._storage)
+
+    def __repr__(self):
+        return f"<Headers {dict(self.items())}>"
@@ -0,0 +1,11 @@
+# methods.py (host shim of adafruit_httpserver.methods)
+
+GET = "GET"
+POST = "POST"
+PUT = "PUT"
+DELETE = "DELETE"
+PATCH = "PATCH"
+HEAD = "HEAD"
+OPTIONS = "OPTIONS"
+TRACE = "TRACE"
+CONNECT = "CONNECT"
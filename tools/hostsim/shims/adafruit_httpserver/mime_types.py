@@ -0,0 +1,35 @@
+# mime_types.py (host shim of adafruit_httpserver.mime_types)
+
+
+class MIMETypes:
+    DEFAULT = "text/plain"
+
+    REGISTERED = {
+        ".css": "text/css",
+        ".gif": "image/gif",
+        ".gz": "application/gzip",
+        ".htm": "text/html",
+        ".html": "text/html",
+        ".ico": "image/vnd.microsoft.icon",
+        ".jpeg": "image/jpeg",
+        ".jpg": "image/jpeg",
+        ".js": "text/javascript",
+        ".json": "application/json",
+        ".mjs": "text/javascript",
+        ".png": "image/png",
+        ".svg": "image/svg+xml",
+        ".txt": "text/plain",
+        ".wasm": "application/wasm",
+        ".webp": "image/webp",
+        ".woff": "font/woff",
+        ".woff2": "font/woff2",
+    }
+
+    @classmethod
+    def get_for_filename(cls, filename, default=None):
+        if default is None:
+            default = cls.DEFAULT
+        dot = filename.rfind(".")
+        if dot < 0:
+            return default
+        return cls.REGISTERED.get(filename[dot:].lower(), default)
@@ -0,0 +1,91 @@
+# request.py (host shim of adafruit_httpserver.request)
+
+import json
+
+from .headers import Headers
+
+
+def _unquote(text):
+    text = text.replace("+", " ")
+    if "%" not in text:
+        return text
+    raw = text.encode()
+    out = bytearray()
+    i = 0
+    while i < len(raw):
+        if raw[i] == 0x25 and i + 2 < len(raw):  # "%xx"
+            out.append(int(raw[i + 1:i + 3], 16))
+            i += 3
+        else:
+            out.append(raw[i])
+            i += 1
+    return out.decode("utf-8", "replace")
+
+
+class QueryParams:
+    def __init__(self, query_string=""):
+        self._storage = {}
+        for pair in query_string.split("&"):
+            if not pair:
+                continue
+            key, _, value = pair.partition("=")
+            self._storage.setdefault(_unquote(key), []).append(_unquote(value))
+
+    def get(self, name, default=None):
+        values = self._storage.get(name)
+        return values[0] if values else default
+
+    def get_list(self, name):
+        return list(self._storage.get(name, []))
+
+    def fields(self):
+        return list(self._storage)
+
+    def __contains__(self, name):
+        return name in self._storage
+
+    def __repr__(self):
+        return f"<QueryParams {self._storage}>"
+
+
+class Request:
+    def __init__(self, server, connection, client_address, raw_request=None):
+        self.server = server
+        self.connection = connection
+        self.client_address = client_address
+        self.raw_request = raw_request
+        self.method = ""
+        self.path = ""
+        self.http_version = ""
+        self.query_params = QueryParams()
+        self.headers = Headers()
+        self._body = b""
+        if raw_request is not None:
+            self._parse(raw_request)
+
+    def _parse(self, raw):
+        head, _, body = raw.partition(b"\r\n\r\n")
+        lines = head.decode("utf-8", "replace").split("\r\n")
+        self.method, target, self.http_version = lines[0].split(" ", 2)
+        self.path, _, query = target.partition("?")
+        self.query_params = QueryParams(query)
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            self.headers[name.strip()] = value.strip()
+        self._body = body
+
+    @property
+    def body(self):
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+
+    def json(self):
+        if not self._body:
+            return None
+        return json.loads(self._body)
+
+    def __repr__(self):
+        return f"<Request {self.method} {self.path} from {self.client_address}>"
@@ -0,0 +1,269 @@
+# response.py (host shim of adafruit_httpserver.response)
+# Same private surface the device code relies on: _send(), _send_headers(),
+# _send_bytes(), _close_connection(), and Websocket._prepare_frame() /
+# _handle_frame().
+
+import json, os
+from base64 import b64encode
+from errno import EAGAIN, ECONNRESET
+from hashlib import sha1
+
+from .headers import Headers
+from .mime_types import MIMETypes
+from .status import Status, OK_200, SWITCHING_PROTOCOLS_101
+
+
+class Response:
+    def __init__(self, request, body="", *, status=OK_200, headers=None, cookies=None, content_type=None):
+        self._request = request
+        self._body = body
+        self._status = status if isinstance(status, Status) else Status(*status)
+        self._headers = headers.copy() if isinstance(headers, Headers) else Headers(headers)
+        self._cookies = dict(cookies or {})
+        self._content_type = content_type
+        self._size = 0
+
+    def _send_headers(self, content_length=None, content_type=None):
+        headers = self._headers.copy()
+        headers.setdefault("Content-Type", content_type or self._content_type or MIMETypes.DEFAULT)
+        if content_length is not None:
+            headers.setdefault("Content-Length", content_length)
+        headers.setdefault("Connection", "close")
+        for name, value in self._request.server.headers.items():
+            headers.setdefault(name, value)
+        lines = [f"HTTP/1.1 {self._status.code} {self._status.text}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines += [f"Set-Cookie: {name}={value}" for name, value in self._cookies.items()]
+        self._send_bytes(self._request.connection, ("\r\n".join(lines) + "\r\n\r\n").encode())
+
+    def _send(self):
+        body = self._body.encode("utf-8") if isinstance(self._body, str) else self._body
+        self._send_headers(len(body), self._content_type)
+        if self._request.method != "HEAD":
+            self._send_bytes(self._request.connection, body)
+        self._close_connection()
+
+    def _send_bytes(self, conn, buffer):
+        view = memoryview(buffer)
+        sent = 0
+        while sent < len(view):
+            try:
+                sent += conn.send(view[sent:])
+            except OSError as exc:
+                if exc.errno == EAGAIN:
+                    continue
+                if exc.errno == ECONNRESET:
+                    return
+                raise
+        self._size += sent
+
+    def _close_connection(self):
+        try:
+            self._request.connection.close()
+        except OSError:
+            pass
+
+
+class JSONResponse(Response):
+    def __init__(self, request, data, *, headers=None, cookies=None, status=OK_200):
+        super().__init__(request, json.dumps(data), headers=headers, cookies=cookies,
+                         status=status, content_type="application/json")
+
+
+class FileResponse(Response):
+    def __init__(self, request, filename="index.html", root_path=None, *, status=OK_200,
+                 headers=None, cookies=None, content_type=None, as_attachment=False,
+                 download_filename=None, buffer_size=1024, head_only=False, safe=True):
+        super().__init__(request, status=status, headers=headers, cookies=cookies,
+                         content_type=content_type or MIMETypes.get_for_filename(filename))
+        root = root_path or request.server.root_path or ""
+        if safe and ".." in filename:
+            raise ValueError("Parent directory references are not allowed")
+        self._path = root + (filename if filename.startswith("/") else "/" + filename)
+        self._filesize = os.stat(self._path)[6]
+        self._buffer_size = buffer_size
+        self._head_only = head_only or request.method == "HEAD"
+        if as_attachment:
+            self._headers.setdefault(
+                "Content-Disposition",
+                f'attachment; filename="{download_filename or filename.split("/")[-1]}"')
+
+    def _send(self):
+        self._send_headers(self._filesize, self._content_type)
+        if not self._head_only:
+            with open(self._path, "rb") as file:
+                while True:
+                    chunk = file.read(self._buffer_size)
+                    if not chunk:
+                        break
+                    self._send_bytes(self._request.connection, chunk)
+        self._close_connection()
+
+
+class ChunkedResponse(Response):
+    def __init__(self, request, body, *, status=OK_200, headers=None, cookies=None, content_type=None):
+        super().__init__(request, body, status=status, headers=headers, cookies=cookies,
+                         content_type=content_type)
+        self._headers.setdefault("Transfer-Encoding", "chunked")
+
+    def _send(self):
+        self._send_headers()
+        for chunk in self._body():
+            data = chunk.encode() if isinstance(chunk, str) else chunk
+            if data:
+                self._send_bytes(self._request.connection, b"%x\r\n" % len(data) + data + b"\r\n")
+        self._send_bytes(self._request.connection, b"0\r\n\r\n")
+        self._close_connection()
+
+
+class Websocket(Response):
+    GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+    FIN = 0x80
+    CONT = 0x0
+    TEXT = 0x1
+    BINARY = 0x2
+    CLOSE = 0x8
+    PING = 0x9
+    PONG = 0xA
+
+    def __init__(self, request, headers=None, buffer_size=1024):
+        if request.headers.get("Upgrade", "").lower() != "websocket":
+            raise ValueError("Request is not a websocket upgrade")
+        key = request.headers.get("Sec-WebSocket-Key")
+        if not key:
+            raise ValueError("Missing Sec-WebSocket-Key")
+        super().__init__(request, status=SWITCHING_PROTOCOLS_101, headers=headers)
+        accept = b64encode(sha1((key + self.GUID).encode()).digest()).decode()
+        self._headers.setdefault("Upgrade", "websocket")
+        self._headers.setdefault("Connection", "Upgrade")
+        self._headers.setdefault("Sec-WebSocket-Accept", accept)
+        self._buffer_size = buffer_size
+        self._inbuf = bytearray()
+        self.closed = False
+
+    def _send(self):
+        lines = [f"HTTP/1.1 {self._status.code} {self._status.text}"]
+        lines += [f"{name}: {value}" for name, value in self._headers.items()]
+        self._send_bytes(self._request.connection, ("\r\n".join(lines) + "\r\n\r\n").encode())
+        self._request.connection.setblocking(False)
+
+    # ---------- frames ----------
+    @staticmethod
+    def _prepare_frame(opcode, message):
+        length = len(message)
+        if length < 126:
+            header = bytes((0x80 | opcode, length))
+        elif length < 65536:
+            header = bytes((0x80 | opcode, 126)) + length.to_bytes(2, "big")
+        else:
+            header = bytes((0x80 | opcode, 127)) + length.to_bytes(8, "big")
+        return header + message
+
+    def _fill(self):
+        """Pull whatever the socket has into the input buffer; False on EOF."""
+        while True:
+            try:
+                chunk = self._request.connection.recv(max(self._buffer_size, 4096))
+            except OSError as exc:
+                if exc.errno == EAGAIN:
+                    return True
+                raise
+            if not chunk:
+                return False
+            self._inbuf += chunk
+
+    def _pop_frame(self):
+        buf = self._inbuf
+        if len(buf) < 2:
+            return None
+        opcode = buf[0] & 0x0F
+        masked = buf[1] & 0x80
+        length = buf[1] & 0x7F
+        pos = 2
+        if length == 126:
+            if len(buf) < 4:
+                return None
+            length = int.from_bytes(buf[2:4], "big")
+            pos = 4
+        elif length == 127:
+            if len(buf) < 10:
+                return None
+            length = int.from_bytes(buf[2:10], "big")
+            pos = 10
+        mask = b""
+        if masked:
+            if len(buf) < pos + 4:
+                return None
+            mask = buf[pos:pos + 4]
+            pos += 4
+        if len(buf) < pos + length:
+            return None
+        payload = bytearray(buf[pos:pos + length])
+        del buf[:pos + length]
+        if masked:
+            for i in range(length):
+                payload[i] ^= mask[i & 3]
+        return opcode, bytes(payload)
+
+    def receive(self, fail_silently=False):
+        if self.closed:
+            if fail_silently:
+                return None
+            raise RuntimeError("Websocket connection is closed, cannot receive messages")
+        try:
+            alive = self._fill()
+        except OSError:
+            self.close()
+            if fail_silently:
+                return None
+            raise
+        frame = self._pop_frame()
+        if frame is None:
+            if not alive:
+                self.close()
+                if not fail_silently:
+                    raise RuntimeError("Websocket connection was closed by the peer")
+            return None
+        return self._handle_frame(self.FIN, *frame)
+
+    def _handle_frame(self, fin, opcode, payload):
+        if opcode == self.CLOSE:
+            self.close()
+            return None
+        if opcode == self.PONG or opcode == self.CONT:
+            return None
+        if opcode == self.PING:
+            self.send_message(payload, self.PONG, fail_silently=True)
+            return payload
+        if opcode == self.TEXT:
+            try:
+                return payload.decode()
+            except UnicodeError:
+                return payload
+        return payload
+
+    def send_message(self, message, opcode=None, fail_silently=False):
+        if self.closed:
+            if fail_silently:
+                return
+            raise RuntimeError("Websocket connection is closed, cannot send message")
+        if opcode is None:
+            opcode = self.TEXT if isinstance(message, str) else self.BINARY
+        data = message.encode() if isinstance(message, str) else bytes(message)
+        try:
+            self._send_bytes(self._request.connection, self._prepare_frame(opcode, data))
+        except OSError:
+            self.close()
+            if not fail_silently:
+                raise
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._send_bytes(self._request.connection, self._prepare_frame(self.CLOSE, b""))
+        except OSError:
+            pass
+        self._close_connection()
+        self.closed = True
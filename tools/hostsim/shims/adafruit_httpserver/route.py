@@ -0,0 +1,43 @@
+# route.py (host shim of adafruit_httpserver.route)
+# Supports "<name>" (one segment) and "<path:name>" (rest of the path) params.
+
+import re
+
+from .methods import GET
+
+
+class Route:
+    def __init__(self, path, methods=GET, handler=None, *, append_slash=False):
+        self.path = path
+        self.methods = set(methods) if isinstance(methods, (set, list, tuple)) else {methods}
+        self.handler = handler
+        self.names = []
+        pattern = ""
+        for part in re.split(r"(<[^>]+>)", path):
+            if part.startswith("<") and part.endswith(">"):
+                kind, _, name = part[1:-1].rpartition(":")
+                self.names.append(name)
+                pattern += "(.+)" if kind == "path" else "([^/]+)"
+            else:
+                pattern += re.escape(part)
+        if append_slash:
+            pattern += "/?"
+        self._regex = re.compile("^" + pattern + "$")
+
+    def match(self, method, path):
+        """Returns the URL parameters dict on a match, else None."""
+        if method not in self.methods and not (method == "HEAD" and GET in self.methods):
+            return None
+        found = self._regex.match(path)
+        if found is None:
+            return None
+        return dict(zip(self.names, found.groups()))
+
+    def __repr__(self):
+        return f"<Route {sorted(self.methods)} {self.path}>"
+
+
+def as_route(path, methods=GET, *, append_slash=False):
+    def decorator(handler):
+        return Route(path, methods, handler, append_slash=append_slash)
+    return decorator
@@ -0,0 +1,147 @@
+# server.py (host shim of adafruit_httpserver.server)
+# Non-blocking accept, one request per poll(), same return codes as the
+# library, and like the library a handler exception closes the connection
+# and propagates out of poll(), so the device loop behaves the same on a host.
+
+import os
+from errno import EAGAIN, ECONNRESET, EPIPE
+
+from .headers import Headers
+from .methods import GET, HEAD
+from .request import Request
+from .response import Response, FileResponse
+from .route import Route
+from .status import NOT_FOUND_404
+
+NO_REQUEST = "no_request"
+CONNECTION_TIMED_OUT = "connection_timed_out"
+REQUEST_HANDLED_NO_RESPONSE = "request_handled_no_response"
+REQUEST_HANDLED_RESPONSE_SENT = "request_handled_response_sent"
+FILE_NOT_FOUND = "file_not_found"
+
+
+class Server:
+    host = None
+    port = None
+
+    def __init__(self, socket_source, root_path=None, *, https=False, certfile=None,
+                 keyfile=None, debug=False):
+        self._pool = socket_source
+        self.root_path = root_path
+        self.debug = debug
+        self.headers = Headers()
+        self.request_buffer_size = 1024
+        self.socket_timeout = 1
+        self.stopped = True
+        self._routes = []
+        self._sock = None
+
+    # ---------- routing ----------
+    def route(self, path, methods=GET, *, append_slash=False):
+        def decorator(handler):
+            self._routes.append(Route(path, methods, handler, append_slash=append_slash))
+            return handler
+        return decorator
+
+    def add_routes(self, routes):
+        self._routes.extend(routes)
+
+    # ---------- lifecycle ----------
+    def start(self, host="0.0.0.0", port=5000):
+        # The device always binds :80; let the harness move it somewhere unprivileged.
+        port = int(os.environ.get("ESP_HOST_PORT", port))
+        self._sock = self._pool.socket(self._pool.AF_INET, self._pool.SOCK_STREAM)
+        self._sock.setsockopt(self._pool.SOL_SOCKET, self._pool.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(10)
+        self._sock.setblocking(False)
+        self.host, self.port = host, self._sock.getsockname()[1]
+        self.stopped = False
+        print(f"[hostsim] adafruit_httpserver listening on http://{host}:{self.port}")
+
+    def serve_forever(self, host="0.0.0.0", port=80):
+        self.start(host, port)
+        while not self.stopped:
+            self.poll()
+
+    def stop(self):
+        self.stopped = True
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    # ---------- requests ----------
+    def _receive_request(self, conn, client_address):
+        raw = b""
+        while b"\r\n\r\n" not in raw:
+            chunk = conn.recv(self.request_buffer_size)
+            if not chunk:
+                return None
+            raw += chunk
+        head, _, body = raw.partition(b"\r\n\r\n")
+        request = Request(self, conn, client_address, raw)
+        length = int(request.headers.get("Content-Length", 0) or 0)
+        while len(body) < length:
+            chunk = conn.recv(self.request_buffer_size)
+            if not chunk:
+                break
+            body += chunk
+        request.body = body
+        return request
+
+    def _find_handler(self, request):
+        for route in self._routes:
+            params = route.match(request.method, request.path)
+            if params is not None:
+                return route.handler, params
+        return None, None
+
+    def _serve_static(self, request):
+        if not self.root_path or request.method not in (GET, HEAD):
+            return Response(request, "Not Found", status=NOT_FOUND_404)
+        path = request.path if request.path != "/" else "/index.html"
+        try:
+            return FileResponse(request, path, self.root_path)
+        except (OSError, ValueError):
+            return Response(request, "Not Found", status=NOT_FOUND_404)
+
+    def poll(self):
+        if self.stopped:
+            raise RuntimeError("Server is stopped")
+        conn = None
+        try:
+            conn, client_address = self._sock.accept()
+            conn.setblocking(True)
+            conn.settimeout(self.socket_timeout)
+            try:
+                request = self._receive_request(conn, client_address)
+            except (OSError, ValueError):
+                request = None
+            if request is None:
+                conn.close()
+                return CONNECTION_TIMED_OUT
+            handler, params = self._find_handler(request)
+            if handler is None:
+                response = self._serve_static(request)
+            else:
+                response = handler(request, **params)
+            if response is None:
+                conn.close()
+                return REQUEST_HANDLED_NO_RESPONSE
+            if not isinstance(response, Response):
+                raise TypeError(f"Route {request.path} returned {type(response).__name__}, not a Response")
+            response._send()
+            return REQUEST_HANDLED_RESPONSE_SENT
+        except Exception as error:
+            if isinstance(error, OSError):
+                if error.errno == EAGAIN:
+                    return NO_REQUEST
+                if error.errno in (ECONNRESET, EPIPE):
+                    if conn is not None:
+                        conn.close()
+                    return NO_REQUEST
+            # Like the library: close the connection and let the caller see
+            # the error (a handler exception stops the device loop too)
+            if conn is not None:
+                conn.close()
+            raise
@@ -0,0 +1,16 @@
+# mdns.py (host shim)
+# Stand-in for CircuitPython's `mdns`: records what would be advertised.
+
+
+class Server:
+    def __init__(self, network_interface):
+        self.hostname = "esp-host"
+        self.instance_name = ""
+        self.services = []
+
+    def advertise_service(self, *, service_type, protocol, port, txt_records=None):
+        self.services.append((service_type, protocol, port))
+        print(f"[hostsim] mdns advertise {service_type}.{protocol} on port {port}")
+
+    def deinit(self):
+        self.services = []
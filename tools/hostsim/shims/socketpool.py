@@ -0,0 +1,23 @@
+# socketpool.py (host shim)
+# Stand-in for CircuitPython's `socketpool`, backed by CPython sockets.
+
+import socket as _socket
+
+
+class SocketPool:
+    AF_INET = _socket.AF_INET
+    SOCK_STREAM = _socket.SOCK_STREAM
+    SOCK_DGRAM = _socket.SOCK_DGRAM
+    SOL_SOCKET = _socket.SOL_SOCKET
+    SO_REUSEADDR = _socket.SO_REUSEADDR
+    IPPROTO_TCP = _socket.IPPROTO_TCP
+    TCP_NODELAY = _socket.TCP_NODELAY
+
+    def __init__(self, radio):
+        self.radio = radio
+
+    def socket(self, family=AF_INET, type=SOCK_STREAM, proto=0):
+        return _socket.socket(family, type, proto)
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        return _socket.getaddrinfo(host, port, family, type, proto, flags)
@@ -0,0 +1,33 @@
+# wifi.py (host shim)
+# Stand-in for CircuitPython's `wifi` module: a radio that "connects"
+# instantly and reports a loopback address.
+
+import os
+
+
+class _Radio:
+    def __init__(self):
+        self.hostname = "esp-host"
+        self.enabled = True
+        self.connected = False
+        self.ap_active = False
+        self.ipv4_address = None
+        self.ipv4_address_ap = None
+        self.ipv4_gateway_ap = None
+
+    def connect(self, ssid, password=None, **kwargs):
+        print(f"[hostsim] wifi.radio.connect({ssid!r})")
+        self.connected = True
+        self.ipv4_address = os.environ.get("ESP_HOST_IP", "127.0.0.1")
+
+    def start_ap(self, ssid, password=None, **kwargs):
+        print(f"[hostsim] wifi.radio.start_ap({ssid!r})")
+        self.ap_active = True
+        self.ipv4_address_ap = os.environ.get("ESP_HOST_IP", "127.0.0.1")
+        self.ipv4_gateway_ap = self.ipv4_address_ap
+
+    def stop_ap(self):
+        self.ap_active = False
+
+
+radio = _Radio()
@@ -0,0 +1,113 @@
+# wsclient.py
+# Tiny dependency-free websocket client for host-side checks and benchmarks.
+
+import os, socket, struct
+from base64 import b64encode
+from urllib.parse import urlsplit
+
+TEXT, BINARY, CLOSE, PING, PONG = 0x1, 0x2, 0x8, 0x9, 0xA
+
+
+class WSClient:
+    def __init__(self, url, timeout=5.0, protocols=None):
+        parts = urlsplit(url)
+        self.url = url
+        self.sock = socket.create_connection((parts.hostname, parts.port or 80), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buf = bytearray()
+        self.closed = False
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        key = b64encode(os.urandom(16)).decode()
+        lines = [
+            f"GET {target} HTTP/1.1",
+            f"Host: {parts.hostname}:{parts.port or 80}",
+            "Upgrade: websocket",
+            "Connection: Upgrade",
+            f"Sec-WebSocket-Key: {key}",
+            "Sec-WebSocket-Version: 13",
+        ]
+        if protocols:
+            lines.append("Sec-WebSocket-Protocol: " + ", ".join(protocols))
+        self.sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode())
+        while b"\r\n\r\n" not in self._buf:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("connection closed during handshake")
+            self._buf += chunk
+        head, _, rest = bytes(self._buf).partition(b"\r\n\r\n")
+        status = head.split(b"\r\n", 1)[0]
+        if b" 101 " not in status + b" ":
+            raise ConnectionError(f"handshake failed: {status.decode(errors='replace')}")
+        self.headers = head.decode(errors="replace")
+        self._buf = bytearray(rest)
+
+    # ---------- send ----------
+    def send(self, message, opcode=None):
+        data = message.encode() if isinstance(message, str) else bytes(message)
+        if opcode is None:
+            opcode = TEXT if isinstance(message, str) else BINARY
+        mask = os.urandom(4)
+        length = len(data)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, 0x80 | length)
+        elif length < 65536:
+            header = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, length)
+        masked = bytes(b ^ mask[i & 3] for i, b in enumerate(data))
+        self.sock.sendall(header + mask + masked)
+
+    # ---------- receive ----------
+    def _need(self, count):
+        while len(self._buf) < count:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("connection closed")
+            self._buf += chunk
+
+    def recv_frame(self, timeout=None):
+        """Returns (opcode, payload bytes); raises socket.timeout when idle."""
+        if timeout is not None:
+            self.sock.settimeout(timeout)
+        self._need(2)
+        opcode = self._buf[0] & 0x0F
+        length = self._buf[1] & 0x7F
+        pos = 2
+        if length == 126:
+            self._need(4)
+            length = struct.unpack("!H", self._buf[2:4])[0]
+            pos = 4
+        elif length == 127:
+            self._need(10)
+            length = struct.unpack("!Q", self._buf[2:10])[0]
+            pos = 10
+        self._need(pos + length)
+        payload = bytes(self._buf[pos:pos + length])
+        del self._buf[:pos + length]
+        return opcode, payload
+
+    def recv(self, timeout=None):
+        """Next text/binary message (str for text); answers pings; None on close."""
+        while True:
+            opcode, payload = self.recv_frame(timeout)
+            if opcode == PING:
+                self.send(payload, PONG)
+                continue
+            if opcode == CLOSE:
+                self.closed = True
+                return None
+            if opcode == TEXT:
+                return payload.decode()
+            if opcode == BINARY:
+                return payload
+
+    def close(self):
+        if not self.closed:
+            try:
+                self.send(b"", CLOSE)
+            except OSError:
+                pass
+        self.closed = True
+        self.sock.close()
@@ -0,0 +1,78 @@
+# pack_words.py
+# Builds the Wordle word list and definitions the server reads from flash.
+#
+# Reads the five-letter entries of src/data/dictionary.js and writes
+#   words.bin  sorted, lowercase, 5 bytes per word, no separators; the device
+#              binary-searches it with seek() (circuitpy/utils/words.py)
+#   defs.idx   header "<4sBxxxI" (b"WDX1", flags, word count), then
+#              count + 1 little-endian u32 offsets into defs.bin; word i's
+#              definition is defs.bin[off[i]:off[i + 1]]
+#   defs.bin   the definitions concatenated as UTF-8, in words.bin order;
+#              with --compress each one is a separate zlib stream (flags
+#              bit 0) so the device only inflates the entry it serves
+#
+#   python tools/pack_words.py [--src src/data/dictionary.js] [--out circuitpy] [--compress]
+
+import argparse, os, re, struct, zlib
+
+REPO = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+WORD_LEN = 5
+ENTRY = re.compile(r'^\s*"?([A-Za-z]+)"?\s*:\s*"(.*)",?\s*$')
+ESCAPE = re.compile(r"\\(.)")
+JS_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+INDEX_MAGIC = b"WDX1"
+INDEX_HEADER = "<4sBxxxI"
+FLAG_ZLIB = 1
+
+
+def read_entries(path):
+    """{word: definition} for the five-letter words of dictionary.js."""
+    entries = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            m = ENTRY.match(line)
+            if not m:
+                continue
+            word = m.group(1).lower()
+            if len(word) != WORD_LEN or not (word.isascii() and word.isalpha()):
+                continue
+            # JS string body -> text
+            entries[word] = ESCAPE.sub(lambda e: JS_ESCAPES.get(e.group(1), e.group(1)), m.group(2))
+    return entries
+
+
+def pack(entries, compress=False):
+    words = sorted(entries)
+    blob = bytearray()
+    offsets = [0]
+    for word in words:
+        data = entries[word].encode("utf-8")
+        if compress:
+            data = zlib.compress(data, 9)
+        blob += data
+        offsets.append(len(blob))
+    index = struct.pack(INDEX_HEADER, INDEX_MAGIC, FLAG_ZLIB if compress else 0, len(words))
+    index += struct.pack(f"<{len(offsets)}I", *offsets)
+    return "".join(words).encode("ascii"), index, bytes(blob)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Pack the Wordle word list and definitions for the device.")
+    ap.add_argument("--src", default=os.path.join(REPO, "src", "data", "dictionary.js"))
+    ap.add_argument("--out", default=os.path.join(REPO, "circuitpy"), help="output folder")
+    ap.add_argument("--compress", action="store_true", help="zlib each definition")
+    args = ap.parse_args()
+
+    entries = read_entries(args.src)
+    words, index, blob = pack(entries, args.compress)
+    for name, data in (("words.bin", words), ("defs.idx", index), ("defs.bin", blob)):
+        path = os.path.join(args.out, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        print(f"{path}: {len(data)} bytes")
+    raw = sum(len(d.encode("utf-8")) for d in entries.values())
+    print(f"{len(entries)} words, definitions {raw} -> {len(blob)} bytes")
+
+
+if __name__ == "__main__":
+    main()